@@ -0,0 +1,182 @@
+"""Partition loan_application_history by month on PostgreSQL
+
+Revision ID: a9e4c7f2b6d8
+Revises: f5c1d8e3a7b9
+Create Date: 2026-10-16 20:06:12.507394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e4c7f2b6d8'
+down_revision: Union[str, Sequence[str], None] = 'f5c1d8e3a7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months of partitions created ahead of the current one
+MONTHS_AHEAD = 3
+
+LATEST_STATUS_MV = """
+    CREATE MATERIALIZED VIEW loan_latest_status_mv AS
+    SELECT la.id,
+           la.loan_application_id,
+           la.application_status,
+           h.timestamp AS last_change
+    FROM loan_applications la
+    LEFT JOIN LATERAL (
+        SELECT timestamp
+        FROM loan_application_history
+        WHERE loan_application_id = la.id
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) h ON true
+"""
+
+CREATE_PARTITION_FUNCTION = """
+    CREATE OR REPLACE FUNCTION create_loan_history_partition(month date)
+    RETURNS void AS $$
+    DECLARE
+        start_ts timestamp := date_trunc('month', month);
+        end_ts timestamp := date_trunc('month', month) + interval '1 month';
+        partition_name text := 'loan_application_history_' || to_char(start_ts, 'YYYY_MM');
+    BEGIN
+        IF to_regclass(partition_name) IS NOT NULL THEN
+            RETURN;
+        END IF;
+        
+        -- Build the partition detached so rows that already fell into the
+        -- DEFAULT partition for this month can be moved in before attaching;
+        -- PostgreSQL refuses the new range while DEFAULT still holds them.
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE loan_application_history INCLUDING DEFAULTS)',
+            partition_name
+        );
+        IF to_regclass('loan_application_history_default') IS NOT NULL THEN
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM loan_application_history_default'
+                '    WHERE "timestamp" >= %L AND "timestamp" < %L RETURNING *'
+                ') INSERT INTO %I SELECT * FROM moved',
+                start_ts,
+                end_ts,
+                partition_name
+            );
+        END IF;
+        EXECUTE format(
+            'ALTER TABLE loan_application_history ATTACH PARTITION %I '
+            'FOR VALUES FROM (%L) TO (%L)',
+            partition_name,
+            start_ts,
+            end_ts
+        );
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _drop_latest_status_view() -> None:
+    op.drop_index('idx_loan_latest_status_mv_loan', table_name='loan_latest_status_mv')
+    op.execute("DROP MATERIALIZED VIEW loan_latest_status_mv")
+
+
+def _create_latest_status_view() -> None:
+    op.execute(LATEST_STATUS_MV)
+    op.create_index(
+        'idx_loan_latest_status_mv_loan',
+        'loan_latest_status_mv',
+        ['loan_application_id'],
+        unique=True
+    )
+
+
+def _create_history_constraints_and_indexes(primary_key: list) -> None:
+    op.create_primary_key('loan_application_history_pkey', 'loan_application_history', primary_key)
+    op.create_foreign_key(
+        'loan_application_history_loan_application_id_fkey',
+        'loan_application_history', 'loan_applications',
+        ['loan_application_id'], ['id']
+    )
+    op.create_foreign_key(
+        'loan_application_history_changed_by_actor_id_fkey',
+        'loan_application_history', 'actors',
+        ['changed_by_actor_id'], ['id']
+    )
+    op.create_index('ix_loan_application_history_id', 'loan_application_history', ['id'], unique=False)
+    op.create_index(
+        'idx_loan_history_loan_ts',
+        'loan_application_history',
+        ['loan_application_id', sa.text('timestamp DESC')],
+        unique=False
+    )
+    op.create_index('idx_loan_history_timestamp', 'loan_application_history', ['timestamp'], unique=False)
+    op.create_index('idx_loan_history_status', 'loan_application_history', ['new_status'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Declarative partitioning is PostgreSQL-only. compliance_events stays
+    # unpartitioned: its unique event_id cannot be enforced across partitions.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    _drop_latest_status_view()
+    
+    op.execute("ALTER TABLE loan_application_history RENAME TO loan_application_history_unpartitioned")
+    op.execute("ALTER SEQUENCE loan_application_history_id_seq OWNED BY NONE")
+    op.execute(
+        'CREATE TABLE loan_application_history '
+        '(LIKE loan_application_history_unpartitioned INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    
+    # Monthly partitions from the oldest row through MONTHS_AHEAD months out,
+    # plus a default partition so an insert never fails for want of one.
+    op.execute(CREATE_PARTITION_FUNCTION)
+    op.execute(
+        f"""
+        SELECT create_loan_history_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', COALESCE(
+                (SELECT min("timestamp") FROM loan_application_history_unpartitioned),
+                now()
+            )),
+            date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+            interval '1 month'
+        ) AS month
+        """
+    )
+    op.execute("CREATE TABLE loan_application_history_default PARTITION OF loan_application_history DEFAULT")
+    
+    op.execute("INSERT INTO loan_application_history SELECT * FROM loan_application_history_unpartitioned")
+    op.execute("DROP TABLE loan_application_history_unpartitioned")
+    op.execute("ALTER SEQUENCE loan_application_history_id_seq OWNED BY loan_application_history.id")
+    
+    # The partition key has to be part of the primary key; indexes declared
+    # on the parent are created on every partition.
+    _create_history_constraints_and_indexes(['id', 'timestamp'])
+    _create_latest_status_view()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    _drop_latest_status_view()
+    
+    op.execute("ALTER TABLE loan_application_history RENAME TO loan_application_history_partitioned")
+    op.execute("ALTER SEQUENCE loan_application_history_id_seq OWNED BY NONE")
+    op.execute(
+        'CREATE TABLE loan_application_history '
+        '(LIKE loan_application_history_partitioned INCLUDING DEFAULTS)'
+    )
+    op.execute("INSERT INTO loan_application_history SELECT * FROM loan_application_history_partitioned")
+    op.execute("DROP TABLE loan_application_history_partitioned")
+    op.execute("DROP FUNCTION create_loan_history_partition(date)")
+    op.execute("ALTER SEQUENCE loan_application_history_id_seq OWNED BY loan_application_history.id")
+    
+    _create_history_constraints_and_indexes(['id'])
+    _create_latest_status_view()
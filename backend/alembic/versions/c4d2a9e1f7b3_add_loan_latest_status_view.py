@@ -0,0 +1,58 @@
+"""Add loan_latest_status_mv materialized view
+
+Revision ID: c4d2a9e1f7b3
+Revises: b08e1f353e69
+Create Date: 2026-10-16 19:50:12.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2a9e1f7b3'
+down_revision: Union[str, Sequence[str], None] = 'b08e1f353e69'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Materialized views are PostgreSQL-only; other backends compute the
+    # latest status from the base tables at query time.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW loan_latest_status_mv AS
+        SELECT la.id,
+               la.loan_application_id,
+               la.application_status,
+               h.timestamp AS last_change
+        FROM loan_applications la
+        LEFT JOIN LATERAL (
+            SELECT timestamp
+            FROM loan_application_history
+            WHERE loan_application_id = la.id
+            ORDER BY timestamp DESC
+            LIMIT 1
+        ) h ON true
+        """
+    )
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        'idx_loan_latest_status_mv_loan',
+        'loan_latest_status_mv',
+        ['loan_application_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('idx_loan_latest_status_mv_loan', table_name='loan_latest_status_mv')
+    op.execute("DROP MATERIALIZED VIEW loan_latest_status_mv")
@@ -0,0 +1,55 @@
+"""Add (entity, timestamp DESC) composite indexes for history lookups
+
+Revision ID: d7a3e5b2c9f1
+Revises: c4d2a9e1f7b3
+Create Date: 2026-10-16 19:52:31.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3e5b2c9f1'
+down_revision: Union[str, Sequence[str], None] = 'c4d2a9e1f7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The composite indexes serve both the equality filter and the
+    # ORDER BY timestamp DESC, so the single-column ones they replace go.
+    op.create_index(
+        'idx_compliance_entity_ts',
+        'compliance_events',
+        ['affected_entity_type', 'affected_entity_id', sa.text('timestamp DESC')],
+        unique=False
+    )
+    op.drop_index('idx_compliance_entity', table_name='compliance_events')
+    op.create_index(
+        'idx_customer_history_customer_ts',
+        'customer_history',
+        ['customer_id', sa.text('timestamp DESC')],
+        unique=False
+    )
+    op.drop_index('idx_customer_history_customer', table_name='customer_history')
+    op.create_index(
+        'idx_loan_history_loan_ts',
+        'loan_application_history',
+        ['loan_application_id', sa.text('timestamp DESC')],
+        unique=False
+    )
+    op.drop_index('idx_loan_history_loan', table_name='loan_application_history')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_loan_history_loan', 'loan_application_history', ['loan_application_id'], unique=False)
+    op.drop_index('idx_loan_history_loan_ts', table_name='loan_application_history')
+    op.create_index('idx_customer_history_customer', 'customer_history', ['customer_id'], unique=False)
+    op.drop_index('idx_customer_history_customer_ts', table_name='customer_history')
+    op.create_index('idx_compliance_entity', 'compliance_events', ['affected_entity_type', 'affected_entity_id'], unique=False)
+    op.drop_index('idx_compliance_entity_ts', table_name='compliance_events')
@@ -0,0 +1,66 @@
+"""Move created/updated/event timestamp defaults to the database
+
+Revision ID: e2b6f4a8d1c5
+Revises: d7a3e5b2c9f1
+Create Date: 2026-10-16 20:00:04.371952
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6f4a8d1c5'
+down_revision: Union[str, Sequence[str], None] = 'd7a3e5b2c9f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TIMESTAMP_COLUMNS = {
+    'actors': ['created_at', 'updated_at'],
+    'customers': ['created_at', 'updated_at'],
+    'customer_history': ['timestamp'],
+    'loan_applications': ['application_date', 'created_at', 'updated_at'],
+    'loan_application_history': ['timestamp'],
+    'loan_documents': ['created_at', 'updated_at'],
+    'compliance_events': ['timestamp'],
+}
+
+
+def _utcnow_default() -> sa.TextClause:
+    """UTC now expression matching shared.database.utcnow for this backend."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return sa.text("TIMEZONE('utc', STATEMENT_TIMESTAMP())")
+    if dialect == 'sqlite':
+        return sa.text("(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))")
+    return sa.text('CURRENT_TIMESTAMP')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    default = _utcnow_default()
+    for table_name, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    existing_nullable=False,
+                    server_default=default
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    existing_nullable=False,
+                    server_default=None
+                )
@@ -0,0 +1,57 @@
+"""Store JSON columns as JSONB on PostgreSQL
+
+Revision ID: f5c1d8e3a7b9
+Revises: e2b6f4a8d1c5
+Create Date: 2026-10-16 20:02:45.880713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c1d8e3a7b9'
+down_revision: Union[str, Sequence[str], None] = 'e2b6f4a8d1c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = [
+    ('actors', 'permissions'),
+    ('customers', 'consent_preferences'),
+    ('compliance_events', 'details'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # JSONB is PostgreSQL-only; other backends keep the generic JSON type.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table_name, column in JSON_COLUMNS:
+        op.alter_column(
+            table_name,
+            column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table_name, column in JSON_COLUMNS:
+        op.alter_column(
+            table_name,
+            column,
+            existing_type=postgresql.JSONB(),
+            type_=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::json'
+        )
@@ -6,13 +6,19 @@ including creation, retrieval, status updates, approval/rejection, and history t
 """
 
 import json
+import base64
+import random
 import secrets
 import hashlib
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 from enum import Enum
 
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Form
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request, status, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 import structlog
 
 from shared.auth import (
@@ -23,6 +29,7 @@ from shared.auth import (
 )
 from shared.database import db_utils, LoanApplicationModel, CustomerModel, LoanDocumentModel
 from shared.fabric_gateway import get_fabric_gateway, ChaincodeClient, ChaincodeType
+from shared.config import settings
 from .models import (
     LoanType,
     ApplicationStatus,
@@ -48,6 +55,34 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter()
 
+# Validates a page of history ORM rows into response models in one call
+_HISTORY_LIST_ADAPTER = TypeAdapter(List[LoanHistoryResponse])
+
+# Permission dependencies built once so endpoints share the same callables
+_CREATE_LOAN_DEP = require_permissions(Permission.CREATE_LOAN_APPLICATION)
+_READ_LOAN_DEP = require_permissions(Permission.READ_LOAN_APPLICATION)
+_UPDATE_LOAN_DEP = require_permissions(Permission.UPDATE_LOAN_APPLICATION)
+_APPROVE_LOAN_DEP = require_permissions(Permission.APPROVE_LOAN)
+_REJECT_LOAN_DEP = require_permissions(Permission.REJECT_LOAN)
+_READ_HISTORY_DEP = require_permissions(Permission.READ_LOAN_HISTORY)
+_MANAGE_DOCS_DEP = require_permissions(Permission.MANAGE_LOAN_DOCUMENTS)
+
+# Allowed clock skew between a history record and its ledger entry
+_HISTORY_TIMESTAMP_TOLERANCE = timedelta(minutes=1)
+
+# CSPRNG for audit report suffixes, built once instead of per request
+_report_id_rng = random.SystemRandom()
+
+# Read size used when streaming uploaded files through the hasher
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Hashes the chaincode recently confirmed as matching: document_id -> document_hash.
+# Only the match is cached; the ledger transaction belongs to the original call.
+_verified_hash_cache: TTLCache = TTLCache(
+    maxsize=settings.DOCUMENT_VERIFICATION_CACHE_SIZE,
+    ttl=settings.DOCUMENT_VERIFICATION_CACHE_TTL_SECONDS
+)
+
 
 # Pydantic models are now imported from models.py
 
@@ -90,9 +125,76 @@ def _check_loan_access_permissions(loan: LoanApplicationModel, current_user: Act
         )
 
 
-def _calculate_file_hash(file_content: bytes) -> str:
-    """Calculate SHA256 hash of file content."""
-    return hashlib.sha256(file_content).hexdigest()
+def get_validated_loan(
+    loan_id: str,
+    current_user: Actor = Depends(get_current_user)
+) -> LoanApplicationModel:
+    """
+    Dependency resolving the path loan after existence and access checks.
+    
+    FastAPI caches the result per request, so endpoints and sub-dependencies
+    that share it trigger only one lookup.
+    """
+    loan = _validate_loan_exists(loan_id)
+    _check_loan_access_permissions(loan, current_user)
+    return loan
+
+
+def get_validated_loan_document(
+    loan_id: str,
+    document_id: int,
+    current_user: Actor = Depends(get_current_user)
+) -> Tuple[LoanApplicationModel, LoanDocumentModel]:
+    """
+    Dependency resolving the path loan and document with one joined query.
+    
+    Falls back to separate lookups only when the join misses, to report
+    which of the loan or document is missing or mismatched.
+    """
+    pair = db_utils.get_loan_and_document(loan_id, document_id)
+    if pair is None:
+        get_validated_loan(loan_id, current_user)
+        if not db_utils.get_loan_document_by_id(document_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document {document_id} not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Document does not belong to this loan application"
+        )
+    
+    loan, document = pair
+    _check_loan_access_permissions(loan, current_user)
+    return loan, document
+
+
+def _calculate_file_hash(file: BinaryIO) -> Tuple[str, int]:
+    """Calculate SHA256 hash and size of a file, reading it in fixed-size blocks."""
+    hasher = hashlib.sha256()
+    file_size = 0
+    for block in iter(lambda: file.read(_UPLOAD_CHUNK_SIZE), b""):
+        hasher.update(block)
+        file_size += len(block)
+    return hasher.hexdigest(), file_size
+
+
+def _encode_history_cursor(timestamp: datetime, record_id: int) -> str:
+    """Encode the (timestamp, id) of the last seen history record as an opaque cursor."""
+    raw = f"{timestamp.isoformat()}|{record_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a history cursor back into its (timestamp, id) keyset position."""
+    try:
+        timestamp, record_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(record_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
 
 
 def _generate_document_id() -> str:
@@ -102,12 +204,13 @@ def _generate_document_id() -> str:
 
 def _validate_file_upload(file: UploadFile) -> None:
     """Validate uploaded file."""
-    # Check file size (10MB limit)
-    max_size = 10 * 1024 * 1024  # 10MB
+    # Check file size (oversized bodies are normally rejected earlier by
+    # Content-Length in the app middleware; this covers chunked uploads)
+    max_size = settings.MAX_UPLOAD_SIZE_BYTES
     if file.size and file.size > max_size:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File size exceeds 10MB limit"
+            detail=f"File size exceeds {max_size // (1024 * 1024)}MB limit"
         )
     
     # Check file type (basic validation)
@@ -130,7 +233,7 @@ def _validate_file_upload(file: UploadFile) -> None:
 @router.post("/", response_model=LoanApplicationResponse, status_code=status.HTTP_201_CREATED)
 async def submit_loan_application(
     loan_data: LoanApplicationCreate,
-    current_user: Actor = Depends(require_permissions(Permission.CREATE_LOAN_APPLICATION))
+    current_user: Actor = Depends(_CREATE_LOAN_DEP)
 ):
     """
     Submit a new loan application.
@@ -244,7 +347,8 @@ async def submit_loan_application(
 @router.get("/{loan_id}", response_model=LoanApplicationResponse)
 async def get_loan_application(
     loan_id: str,
-    current_user: Actor = Depends(require_permissions(Permission.READ_LOAN_APPLICATION))
+    current_user: Actor = Depends(_READ_LOAN_DEP),
+    loan: LoanApplicationModel = Depends(get_validated_loan)
 ):
     """
     Retrieve a loan application by ID.
@@ -256,12 +360,6 @@ async def get_loan_application(
                    loan_id=loan_id,
                    actor_id=current_user.actor_id)
         
-        # Validate loan exists
-        loan = _validate_loan_exists(loan_id)
-        
-        # Check access permissions
-        _check_loan_access_permissions(loan, current_user)
-        
         # Get customer information by querying with the foreign key
         with db_utils.db_manager.session_scope() as session:
             customer = session.query(CustomerModel).filter(
@@ -309,7 +407,7 @@ async def get_loan_application(
 async def update_loan_status(
     loan_id: str,
     status_update: LoanStatusUpdate,
-    current_user: Actor = Depends(require_permissions(Permission.UPDATE_LOAN_APPLICATION))
+    current_user: Actor = Depends(_UPDATE_LOAN_DEP)
 ):
     """
     Update loan application status.
@@ -427,7 +525,7 @@ async def update_loan_status(
 async def approve_loan(
     loan_id: str,
     approval_request: LoanApprovalRequest,
-    current_user: Actor = Depends(require_permissions(Permission.APPROVE_LOAN))
+    current_user: Actor = Depends(_APPROVE_LOAN_DEP)
 ):
     """
     Approve a loan application.
@@ -565,7 +663,7 @@ async def approve_loan(
 async def reject_loan(
     loan_id: str,
     rejection_request: LoanRejectionRequest,
-    current_user: Actor = Depends(require_permissions(Permission.REJECT_LOAN))
+    current_user: Actor = Depends(_REJECT_LOAN_DEP)
 ):
     """
     Reject a loan application.
@@ -706,19 +804,23 @@ async def get_loan_history(
     loan_id: str,
     page: int = 1,
     page_size: int = 50,
+    cursor: Optional[str] = None,
     change_type: Optional[str] = None,
     actor_id: Optional[int] = None,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
     status: Optional[str] = None,
     verify_integrity: bool = False,
-    current_user: Actor = Depends(require_permissions(Permission.READ_LOAN_HISTORY))
+    current_user: Actor = Depends(_READ_HISTORY_DEP),
+    loan: LoanApplicationModel = Depends(get_validated_loan)
 ):
     """
     Get loan application history with filtering and pagination.
     
     Returns complete audit trail of all changes to the loan application
     with optional filtering, pagination, and integrity verification.
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the following
+    page without an OFFSET scan.
     """
     try:
         logger.info("Retrieving loan application history",
@@ -739,11 +841,7 @@ async def get_loan_history(
                 detail="Page size must be between 1 and 1000"
             )
         
-        # Validate loan exists
-        loan = _validate_loan_exists(loan_id)
-        
-        # Check access permissions
-        _check_loan_access_permissions(loan, current_user)
+        keyset = _decode_history_cursor(cursor) if cursor else None
         
         # Build filter criteria
         filter_criteria = LoanHistoryFilter(
@@ -755,45 +853,22 @@ async def get_loan_history(
         )
         
         # Get filtered and paginated history records
-        try:
-            result = db_utils.get_loan_history_paginated(
-                loan_id, 
-                page, 
-                page_size, 
-                filter_criteria
-            )
-            if isinstance(result, tuple) and len(result) == 2:
-                history_records, total_count = result
-            else:
-                # Handle case where method doesn't return tuple
-                raise AttributeError("Method doesn't return expected tuple")
-        except (AttributeError, ValueError):
-            # Fallback to old method for backward compatibility
-            history_records = db_utils.get_loan_history(loan_id)
-            total_count = len(history_records)
-            
-            # Apply manual pagination
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            history_records = history_records[start_idx:end_idx]
+        history_records, total_count = db_utils.get_loan_history_paginated(
+            loan_id,
+            page,
+            page_size,
+            filter_criteria,
+            cursor=keyset,
+            lookahead=True
+        )
         
-        # Convert to response format
-        response_items = []
-        for record in history_records:
-            item = LoanHistoryResponse(
-                id=record.id,
-                change_type=record.change_type,
-                previous_status=record.previous_status,
-                new_status=record.new_status,
-                field_name=record.field_name,
-                old_value=record.old_value,
-                new_value=record.new_value,
-                changed_by_actor_id=record.changed_by_actor_id,
-                blockchain_transaction_id=record.blockchain_transaction_id,
-                timestamp=record.timestamp,
-                notes=record.notes
-            )
-            
+        # The extra lookahead row only signals that another page exists
+        has_more = len(history_records) > page_size
+        history_records = history_records[:page_size]
+        
+        # Convert to response format in one validator pass over the ORM rows
+        response_items = _HISTORY_LIST_ADAPTER.validate_python(history_records)
+        for item, record in zip(response_items, history_records):
             # Perform integrity verification if requested
             if verify_integrity and record.blockchain_transaction_id:
                 try:
@@ -807,13 +882,22 @@ async def get_loan_history(
                     logger.warning("Failed to verify history integrity",
                                  record_id=record.id,
                                  error=str(e))
-            
-            response_items.append(item)
         
-        # Calculate pagination metadata
-        total_pages = (total_count + page_size - 1) // page_size
-        has_next = page < total_pages
-        has_previous = page > 1
+        # Calculate pagination metadata; keyset pages skip the count and
+        # ignore ``page``, so they report no total
+        if keyset:
+            total_pages = None
+            has_next = has_more
+            has_previous = True
+        else:
+            total_pages = (total_count + page_size - 1) // page_size
+            has_next = page < total_pages
+            has_previous = page > 1
+        
+        next_cursor = None
+        if has_more:
+            last_record = history_records[-1]
+            next_cursor = _encode_history_cursor(last_record.timestamp, last_record.id)
         
         response_data = PaginatedLoanHistoryResponse(
             items=response_items,
@@ -822,7 +906,8 @@ async def get_loan_history(
             page_size=page_size,
             total_pages=total_pages,
             has_next=has_next,
-            has_previous=has_previous
+            has_previous=has_previous,
+            next_cursor=next_cursor
         )
         
         logger.info("Loan history retrieved successfully",
@@ -847,7 +932,8 @@ async def get_loan_history(
 async def generate_audit_report(
     loan_id: str,
     report_request: AuditReportRequest,
-    current_user: Actor = Depends(require_permissions(Permission.READ_LOAN_HISTORY))
+    current_user: Actor = Depends(_READ_HISTORY_DEP),
+    loan: LoanApplicationModel = Depends(get_validated_loan)
 ):
     """
     Generate comprehensive audit report for loan application.
@@ -860,14 +946,8 @@ async def generate_audit_report(
                    report_type=report_request.report_type,
                    actor_id=current_user.actor_id)
         
-        # Validate loan exists
-        loan = _validate_loan_exists(loan_id)
-        
-        # Check access permissions
-        _check_loan_access_permissions(loan, current_user)
-        
         # Generate unique report ID
-        report_id = f"AUDIT_{loan_id}_{secrets.token_hex(4).upper()}"
+        report_id = f"AUDIT_{loan_id}_{_report_id_rng.randrange(1 << 32):08X}"
         
         # Get complete history for the loan
         all_history = db_utils.get_loan_history(loan_id)
@@ -889,30 +969,42 @@ async def generate_audit_report(
         verification_details = []
         
         if report_request.include_blockchain_verification:
-            for record in filtered_history:
-                if record.blockchain_transaction_id:
-                    try:
-                        is_verified = await _verify_history_integrity(record)
-                        if is_verified:
-                            blockchain_hash_matches += 1
-                        verification_details.append({
-                            "record_id": record.id,
-                            "transaction_id": record.blockchain_transaction_id,
-                            "verified": is_verified,
-                            "timestamp": record.timestamp.isoformat()
-                        })
-                    except Exception as e:
-                        logger.warning("Verification failed for record",
-                                     record_id=record.id,
-                                     error=str(e))
-                        integrity_verified = False
-                        verification_details.append({
-                            "record_id": record.id,
-                            "transaction_id": record.blockchain_transaction_id,
-                            "verified": False,
-                            "error": str(e),
-                            "timestamp": record.timestamp.isoformat()
-                        })
+            records_to_verify = [r for r in filtered_history if r.blockchain_transaction_id]
+            # One ledger query covers every record of the loan
+            ledger_records = None
+            ledger_error = None
+            if records_to_verify:
+                try:
+                    ledger_records = _index_ledger_history(
+                        await _fetch_ledger_history(loan.loan_application_id)
+                    )
+                except Exception as e:
+                    logger.warning("Failed to fetch ledger history for verification",
+                                 loan_id=loan_id,
+                                 error=str(e))
+                    integrity_verified = False
+                    ledger_error = str(e)
+            
+            for record in records_to_verify:
+                if ledger_error is not None:
+                    verification_details.append({
+                        "record_id": record.id,
+                        "transaction_id": record.blockchain_transaction_id,
+                        "verified": False,
+                        "error": ledger_error,
+                        "timestamp": record.timestamp
+                    })
+                    continue
+                
+                verified = _matches_ledger_record(record, ledger_records)
+                if verified:
+                    blockchain_hash_matches += 1
+                verification_details.append({
+                    "record_id": record.id,
+                    "transaction_id": record.blockchain_transaction_id,
+                    "verified": verified,
+                    "timestamp": record.timestamp
+                })
         
         # Build audit report data
         audit_data = {
@@ -922,8 +1014,8 @@ async def generate_audit_report(
                 "current_status": loan.application_status,
                 "requested_amount": loan.requested_amount,
                 "approval_amount": loan.approval_amount,
-                "created_at": loan.created_at.isoformat(),
-                "updated_at": loan.updated_at.isoformat()
+                "created_at": loan.created_at,
+                "updated_at": loan.updated_at
             },
             "history_summary": {
                 "total_changes": len(filtered_history),
@@ -935,7 +1027,7 @@ async def generate_audit_report(
             "timeline": [
                 {
                     "id": record.id,
-                    "timestamp": record.timestamp.isoformat(),
+                    "timestamp": record.timestamp,
                     "change_type": record.change_type,
                     "previous_status": record.previous_status,
                     "new_status": record.new_status,
@@ -963,7 +1055,7 @@ async def generate_audit_report(
         response_data = AuditReportResponse(
             report_id=report_id,
             report_type=report_request.report_type,
-            generated_at=datetime.utcnow(),
+            generated_at=datetime.now(timezone.utc),
             total_records=len(filtered_history),
             integrity_verified=integrity_verified,
             blockchain_hash_matches=blockchain_hash_matches,
@@ -988,44 +1080,72 @@ async def generate_audit_report(
         )
 
 
+def _parse_blockchain_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 ledger timestamp into a naive UTC datetime matching DB columns."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+async def _fetch_ledger_history(loan_application_id: str) -> List[Dict[str, Any]]:
+    """Query the ledger's history entries for a loan application."""
+    gateway = await get_fabric_gateway()
+    blockchain_result = await gateway.query_chaincode(
+        "loan",
+        "GetLoanHistory",
+        [loan_application_id]
+    )
+    if not blockchain_result:
+        return []
+    return json.loads(blockchain_result)
+
+
+def _index_ledger_history(blockchain_history: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Key ledger history entries by transaction ID."""
+    return {
+        entry["transactionID"]: entry
+        for entry in blockchain_history
+        if entry.get("transactionID")
+    }
+
+
+def _matches_ledger_record(
+    history_record: 'LoanApplicationHistoryModel',
+    ledger_records: Dict[str, Dict[str, Any]]
+) -> bool:
+    """Check a history record against the ledger entry with its transaction ID."""
+    blockchain_record = ledger_records.get(history_record.blockchain_transaction_id)
+    if not blockchain_record:
+        return False
+    
+    # Verify key fields match; only the matching entry's timestamp is parsed
+    blockchain_timestamp = blockchain_record.get("timestamp")
+    if (blockchain_record.get("changeType") != history_record.change_type or
+            not blockchain_timestamp):
+        return False
+    
+    skew = abs(_parse_blockchain_timestamp(blockchain_timestamp) - history_record.timestamp)
+    return skew < _HISTORY_TIMESTAMP_TOLERANCE
+
+
 async def _verify_history_integrity(history_record: 'LoanApplicationHistoryModel') -> bool:
     """
     Verify the integrity of a history record against blockchain data.
     
-    This function would typically query the blockchain to verify that the
+    Queries the ledger history of the record's loan and checks that the
     recorded transaction ID and data match what's stored on the ledger.
     """
     try:
         if not history_record.blockchain_transaction_id:
             return False
         
-        # Get blockchain data for verification
-        gateway = await get_fabric_gateway()
-        
-        # Query blockchain for the specific transaction
-        blockchain_result = await gateway.query_chaincode(
-            "loan",
-            "GetLoanHistory",
-            [history_record.loan_application.loan_application_id]
+        blockchain_history = await _fetch_ledger_history(
+            history_record.loan_application.loan_application_id
         )
-        
-        if not blockchain_result:
-            return False
-        
-        # Parse blockchain history and find matching transaction
-        blockchain_history = json.loads(blockchain_result)
-        
-        # Find the matching transaction in blockchain history
-        for blockchain_record in blockchain_history:
-            if blockchain_record.get("transactionID") == history_record.blockchain_transaction_id:
-                # Verify key fields match
-                if (blockchain_record.get("changeType") == history_record.change_type and
-                    blockchain_record.get("timestamp") and
-                    abs((datetime.fromisoformat(blockchain_record["timestamp"].replace('Z', '+00:00')) - 
-                         history_record.timestamp).total_seconds()) < 60):  # Allow 1 minute tolerance
-                    return True
-        
-        return False
+        return _matches_ledger_record(history_record, _index_ledger_history(blockchain_history))
         
     except Exception as e:
         logger.error("Failed to verify history integrity",
@@ -1040,7 +1160,8 @@ async def upload_document(
     file: UploadFile = File(...),
     document_type: DocumentType = Form(...),
     document_name: Optional[str] = Form(None),
-    current_user: Actor = Depends(require_permissions(Permission.MANAGE_LOAN_DOCUMENTS))
+    current_user: Actor = Depends(_MANAGE_DOCS_DEP),
+    loan: LoanApplicationModel = Depends(get_validated_loan)
 ):
     """
     Upload a document for a loan application.
@@ -1055,56 +1176,50 @@ async def upload_document(
                    filename=file.filename,
                    actor_id=current_user.actor_id)
         
-        # Validate loan exists
-        loan = _validate_loan_exists(loan_id)
-        
-        # Check access permissions
-        _check_loan_access_permissions(loan, current_user)
-        
         # Validate file upload
         _validate_file_upload(file)
         
         # Get current user's database record
-        db_actor = db_utils.get_actor_by_actor_id(current_user.actor_id)
+        db_actor = await run_in_threadpool(db_utils.get_actor_by_actor_id, current_user.actor_id)
         if not db_actor:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Actor not found in database"
             )
         
-        # Read file content and calculate hash
-        file_content = await file.read()
-        document_hash = _calculate_file_hash(file_content)
+        # Stream file content through the hasher instead of buffering it whole
+        document_hash, file_size = await run_in_threadpool(_calculate_file_hash, file.file)
+        document_type_value = document_type.value
         
         # Use provided document name or file name
-        final_document_name = document_name or file.filename or f"document_{document_type.value.lower()}"
+        final_document_name = document_name or file.filename or f"document_{document_type_value.lower()}"
         
         # Prepare document data for database
         document_data = {
             "loan_application_id": loan.id,  # Use database ID for foreign key
-            "document_type": document_type.value,
+            "document_type": document_type_value,
             "document_name": final_document_name,
             "document_hash": document_hash,
-            "file_size": len(file_content),
+            "file_size": file_size,
             "mime_type": file.content_type,
             "verification_status": DocumentStatus.PENDING.value,
             "uploaded_by_actor_id": db_actor.id
         }
         
         # Create document record in database
-        db_document = db_utils.create_loan_document(document_data)
+        db_document = await run_in_threadpool(db_utils.create_loan_document, document_data)
         
         # Record document hash on blockchain
         try:
             gateway = await get_fabric_gateway()
             
             # Get customer ID for blockchain record
-            customer = db_utils.get_customer_by_customer_id(loan.customer.customer_id)
+            customer = await run_in_threadpool(db_utils.get_customer_by_customer_id, loan.customer.customer_id)
             
             blockchain_data = {
                 "loanApplicationID": loan_id,
                 "customerID": customer.customer_id,
-                "documentType": document_type.value,
+                "documentType": document_type_value,
                 "documentName": final_document_name,
                 "documentHash": document_hash,
                 "actorID": current_user.actor_id
@@ -1116,7 +1231,7 @@ async def upload_document(
                 [
                     loan_id,
                     customer.customer_id,
-                    document_type.value,
+                    document_type_value,
                     final_document_name,
                     document_hash,
                     current_user.actor_id
@@ -1125,7 +1240,8 @@ async def upload_document(
             
             # Update document with blockchain record hash
             if blockchain_result.get("transaction_id"):
-                db_utils.update_document_verification_status(
+                await run_in_threadpool(
+                    db_utils.update_document_verification_status,
                     db_document.id,
                     DocumentStatus.PENDING.value,
                     blockchain_result.get("transaction_id")
@@ -1182,7 +1298,8 @@ async def get_loan_documents(
     loan_id: str,
     document_type: Optional[DocumentType] = None,
     verification_status: Optional[DocumentStatus] = None,
-    current_user: Actor = Depends(require_permissions(Permission.READ_LOAN_APPLICATION))
+    current_user: Actor = Depends(_READ_LOAN_DEP),
+    loan: LoanApplicationModel = Depends(get_validated_loan)
 ):
     """
     Get all documents for a loan application.
@@ -1197,22 +1314,18 @@ async def get_loan_documents(
                    verification_status=verification_status,
                    actor_id=current_user.actor_id)
         
-        # Validate loan exists
-        loan = _validate_loan_exists(loan_id)
-        
-        # Check access permissions
-        _check_loan_access_permissions(loan, current_user)
-        
         # Get documents from database
-        documents = db_utils.get_loan_documents(loan_id)
+        documents = await run_in_threadpool(db_utils.get_loan_documents, loan_id)
         
-        # Apply filters if specified
+        # Apply filters if specified (bind enum values once, outside the comprehensions)
         filtered_documents = documents
         if document_type:
-            filtered_documents = [doc for doc in filtered_documents if doc.document_type == document_type.value]
+            target_type = document_type.value
+            filtered_documents = [doc for doc in filtered_documents if doc.document_type == target_type]
         
         if verification_status:
-            filtered_documents = [doc for doc in filtered_documents if doc.verification_status == verification_status.value]
+            target_status = verification_status.value
+            filtered_documents = [doc for doc in filtered_documents if doc.verification_status == target_status]
         
         # Convert to response format
         response_data = []
@@ -1254,7 +1367,8 @@ async def update_document_status(
     loan_id: str,
     document_id: int,
     status_update: DocumentStatusUpdate,
-    current_user: Actor = Depends(require_permissions(Permission.MANAGE_LOAN_DOCUMENTS))
+    current_user: Actor = Depends(_MANAGE_DOCS_DEP),
+    loan_document: Tuple[LoanApplicationModel, LoanDocumentModel] = Depends(get_validated_loan_document)
 ):
     """
     Update document verification status.
@@ -1269,25 +1383,7 @@ async def update_document_status(
                    new_status=status_update.verification_status,
                    actor_id=current_user.actor_id)
         
-        # Validate loan exists
-        loan = _validate_loan_exists(loan_id)
-        
-        # Check access permissions
-        _check_loan_access_permissions(loan, current_user)
-        
-        # Validate document exists and belongs to the loan
-        document = db_utils.get_loan_document_by_id(document_id)
-        if not document:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document {document_id} not found"
-            )
-        
-        if document.loan_application_id != loan.id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Document does not belong to this loan application"
-            )
+        loan, document = loan_document
         
         # Validate status transition
         old_status = document.verification_status
@@ -1299,8 +1395,10 @@ async def update_document_status(
                 detail=f"Document is already in {new_status} status"
             )
         
-        # Update status in database
-        success = db_utils.update_document_verification_status(
+        # Each db_utils call opens and closes its own session, so no pooled
+        # connection is held across the chaincode await below
+        success = await run_in_threadpool(
+            db_utils.update_document_verification_status,
             document_id,
             new_status
         )
@@ -1311,12 +1409,15 @@ async def update_document_status(
                 detail="Failed to update document status in database"
             )
         
+        # Force the next verification back to the chaincode
+        _verified_hash_cache.pop(document_id, None)
+        
         # Update blockchain record
         try:
             gateway = await get_fabric_gateway()
             
             # Generate a document ID for blockchain (using database ID)
-            blockchain_document_id = f"DOC_{document_id}"
+            blockchain_document_id = "DOC_%d" % document_id
             
             blockchain_result = await gateway.invoke_chaincode(
                 "loan",
@@ -1342,7 +1443,7 @@ async def update_document_status(
             # Continue with database update even if blockchain fails
         
         # Retrieve updated document
-        updated_document = db_utils.get_loan_document_by_id(document_id)
+        updated_document = await run_in_threadpool(db_utils.get_loan_document_by_id, document_id)
         
         response_data = LoanDocumentResponse(
             id=updated_document.id,
@@ -1380,11 +1481,14 @@ async def update_document_status(
         )
 
 
-@router.post("/{loan_id}/documents/{document_id}/verify", response_model=Dict[str, Any])
+@router.post("/{loan_id}/documents/{document_id}/verify")
 async def verify_document_hash(
     loan_id: str,
     document_id: int,
-    current_user: Actor = Depends(require_permissions(Permission.MANAGE_LOAN_DOCUMENTS))
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: Actor = Depends(_MANAGE_DOCS_DEP),
+    loan_document: Tuple[LoanApplicationModel, LoanDocumentModel] = Depends(get_validated_loan_document)
 ):
     """
     Verify document hash against blockchain record.
@@ -1398,73 +1502,72 @@ async def verify_document_hash(
                    document_id=document_id,
                    actor_id=current_user.actor_id)
         
-        # Validate loan exists
-        loan = _validate_loan_exists(loan_id)
-        
-        # Check access permissions
-        _check_loan_access_permissions(loan, current_user)
-        
-        # Validate document exists and belongs to the loan
-        document = db_utils.get_loan_document_by_id(document_id)
-        if not document:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document {document_id} not found"
-            )
-        
-        if document.loan_application_id != loan.id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Document does not belong to this loan application"
-            )
+        loan, document = loan_document
+        # Read the stored hash once; it is reused for the cache, chaincode call and response
+        document_hash = document.document_hash
         
         # Verify hash against blockchain
         verification_result = {
             "document_id": document_id,
             "loan_application_id": loan_id,
-            "document_hash": document.document_hash,
-            "verification_timestamp": datetime.utcnow().isoformat(),
+            "document_hash": document_hash,
+            "verification_timestamp": datetime.now(timezone.utc),
             "verified_by": current_user.actor_id,
             "blockchain_verified": False,
             "verification_details": {}
         }
         
         try:
-            gateway = await get_fabric_gateway()
-            
-            # Generate blockchain document ID
-            blockchain_document_id = f"DOC_{document_id}"
+            # Reuse a recent on-chain match of the same hash; no new ledger
+            # transaction is made, so none is reported for this request
+            cache_hit = _verified_hash_cache.get(document_id) == document_hash
             
-            blockchain_result = await gateway.invoke_chaincode(
-                "loan",
-                "VerifyDocumentHash",
-                [
-                    blockchain_document_id,
-                    document.document_hash,
-                    current_user.actor_id
-                ]
-            )
+            if cache_hit:
+                blockchain_result = {
+                    "success": True,
+                    "stored_hash": document_hash,
+                    "hash_match": True,
+                    "transaction_id": None
+                }
+            else:
+                # Prefer the gateway opened at startup over a pool lookup
+                gateway = getattr(request.app.state, "fabric_gateway", None) or await get_fabric_gateway()
+                
+                # Generate blockchain document ID
+                blockchain_document_id = "DOC_%d" % document_id
+                
+                blockchain_result = await gateway.invoke_chaincode(
+                    "loan",
+                    "VerifyDocumentHash",
+                    [
+                        blockchain_document_id,
+                        document_hash,
+                        current_user.actor_id
+                    ]
+                )
+                
+                if blockchain_result.get("success") and blockchain_result.get("hash_match"):
+                    _verified_hash_cache[document_id] = document_hash
             
             # Parse blockchain response
             if blockchain_result.get("success"):
                 verification_result["blockchain_verified"] = True
                 verification_result["verification_details"] = {
                     "blockchain_hash": blockchain_result.get("stored_hash"),
-                    "provided_hash": document.document_hash,
+                    "provided_hash": document_hash,
                     "match": blockchain_result.get("hash_match", False),
-                    "transaction_id": blockchain_result.get("transaction_id")
+                    "transaction_id": blockchain_result.get("transaction_id"),
+                    "cached": cache_hit
                 }
                 
-                # Update document verification status if verified
-                if blockchain_result.get("hash_match"):
-                    db_utils.update_document_verification_status(
-                        document_id,
-                        DocumentStatus.VERIFIED.value
-                    )
-                else:
-                    db_utils.update_document_verification_status(
+                # Record the verification status after the response is sent
+                # (a cache hit was already recorded as VERIFIED when stored)
+                if not cache_hit:
+                    background_tasks.add_task(
+                        db_utils.update_document_verification_status,
                         document_id,
-                        DocumentStatus.FAILED.value
+                        DocumentStatus.VERIFIED.value if blockchain_result.get("hash_match")
+                        else DocumentStatus.FAILED.value
                     )
             else:
                 verification_result["verification_details"] = {
@@ -1485,7 +1588,8 @@ async def verify_document_hash(
                 "error": f"Blockchain verification failed: {str(e)}"
             }
         
-        return verification_result
+        # Ad-hoc dict, so skip response model validation and serialize directly
+        return ORJSONResponse(verification_result)
         
     except HTTPException:
         raise
@@ -8,7 +8,7 @@ for data validation, serialization, and documentation.
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 
 
 class LoanType(str, Enum):
@@ -34,19 +34,10 @@ class ApplicationStatus(str, Enum):
 class LoanApplicationCreate(BaseModel):
     """Schema for creating a new loan application."""
     customer_id: str = Field(..., description="Customer ID for the loan application")
-    requested_amount: float = Field(..., gt=0, description="Requested loan amount")
+    requested_amount: float = Field(..., gt=0, le=10_000_000, description="Requested loan amount")
     loan_type: LoanType = Field(..., description="Type of loan")
     introducer_id: Optional[str] = Field(None, description="External partner/introducer ID")
     additional_info: Optional[Dict[str, Any]] = Field(None, description="Additional application information")
-    
-    @validator('requested_amount')
-    def validate_amount(cls, v):
-        """Validate loan amount is reasonable."""
-        if v <= 0:
-            raise ValueError('Requested amount must be greater than 0')
-        if v > 10_000_000:  # 10M limit for demo
-            raise ValueError('Requested amount exceeds maximum limit')
-        return v
 
 
 class LoanApplicationUpdate(BaseModel):
@@ -60,29 +51,13 @@ class LoanStatusUpdate(BaseModel):
     """Schema for updating loan application status."""
     new_status: ApplicationStatus = Field(..., description="New status for the loan application")
     notes: Optional[str] = Field(None, description="Notes about the status change")
-    
-    @validator('new_status')
-    def validate_status_transition(cls, v):
-        """Basic status validation - more complex logic would be in business layer."""
-        if v not in ApplicationStatus:
-            raise ValueError(f'Invalid status: {v}')
-        return v
 
 
 class LoanApprovalRequest(BaseModel):
     """Schema for loan approval."""
-    approval_amount: float = Field(..., gt=0, description="Approved loan amount")
+    approval_amount: float = Field(..., gt=0, le=10_000_000, description="Approved loan amount")
     notes: Optional[str] = Field(None, description="Approval notes")
     conditions: Optional[List[str]] = Field(None, description="Approval conditions")
-    
-    @validator('approval_amount')
-    def validate_approval_amount(cls, v):
-        """Validate approval amount."""
-        if v <= 0:
-            raise ValueError('Approval amount must be greater than 0')
-        if v > 10_000_000:  # 10M limit for demo
-            raise ValueError('Approval amount exceeds maximum limit')
-        return v
 
 
 class LoanRejectionRequest(BaseModel):
@@ -154,12 +129,14 @@ class LoanHistoryFilter(BaseModel):
 class PaginatedLoanHistoryResponse(BaseModel):
     """Schema for paginated loan history response."""
     items: List[LoanHistoryResponse]
-    total: int
+    # Not counted for cursor (keyset) pages
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
 
 
 class AuditReportRequest(BaseModel):
@@ -186,16 +163,9 @@ class AuditReportResponse(BaseModel):
 class DocumentUploadRequest(BaseModel):
     """Schema for document upload metadata."""
     document_type: DocumentType = Field(..., description="Type of document")
-    document_name: str = Field(..., description="Name of the document")
+    document_name: str = Field(..., min_length=1, max_length=255, description="Name of the document")
     
-    @validator('document_name')
-    def validate_document_name(cls, v):
-        """Validate document name."""
-        if not v or len(v.strip()) == 0:
-            raise ValueError('Document name cannot be empty')
-        if len(v) > 255:
-            raise ValueError('Document name too long')
-        return v.strip()
+    model_config = {"str_strip_whitespace": True}
 
 
 class LoanDocumentResponse(BaseModel):
@@ -1,19 +1,31 @@
 """
 Main FastAPI application entry point
 """
-from fastapi import FastAPI
+import asyncio
+from typing import Callable
+
+import structlog
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.formparsers import MultiPartParser
 
 from customer_mastery.api import router as customer_router
 from loan_origination.api import router as loan_router
 from compliance_reporting.api import router as compliance_router
 from event_listener.api import get_consistency_router
 from shared.config import settings
+from shared.database import db_utils
+from shared.fabric_gateway import get_fabric_gateway, cleanup_gateway_pool
+
+logger = structlog.get_logger(__name__)
 
 app = FastAPI(
     title="origin.block FastAPI backend",
     description="API services for blockchain-based financial operations",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -25,6 +37,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keep accepted uploads in memory rather than spooling them to disk past 1MB.
+# This is a class attribute, so it applies process-wide to every multipart
+# form parsed by any route, not only document uploads.
+MultiPartParser.max_file_size = settings.MAX_UPLOAD_SIZE_BYTES
+
+# Headroom for multipart boundaries and form fields around the file itself
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """
+    Reject oversized bodies from Content-Length before any of the body is read.
+    
+    Applies app-wide: every route shares the upload ceiling, which sits well
+    above any JSON payload the API accepts.
+    """
+    content_length = request.headers.get("content-length")
+    if (content_length and content_length.isdigit() and
+            int(content_length) > settings.MAX_UPLOAD_SIZE_BYTES + _MULTIPART_OVERHEAD_BYTES):
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"File size exceeds {settings.MAX_UPLOAD_SIZE_BYTES // (1024 * 1024)}MB limit"}
+        )
+    return await call_next(request)
+
+
+@app.on_event("startup")
+async def connect_fabric_gateway():
+    """Open the shared Fabric gateway once so handlers skip the connection handshake."""
+    app.state.fabric_gateway = await get_fabric_gateway()
+
+
+@app.on_event("shutdown")
+async def disconnect_fabric_gateway():
+    """Close pooled Fabric gateway connections."""
+    await cleanup_gateway_pool()
+    app.state.fabric_gateway = None
+
+
+async def run_periodically(interval_seconds: float, job: Callable[[], None]) -> None:
+    """Run a blocking database maintenance job now and then every ``interval_seconds``."""
+    while True:
+        try:
+            await run_in_threadpool(job)
+        except Exception as e:
+            logger.warning("Database maintenance job failed", job=job.__name__, error=str(e))
+        await asyncio.sleep(interval_seconds)
+
+
+@app.on_event("startup")
+async def start_database_maintenance():
+    """Keep PostgreSQL read models and history partitions current in the background."""
+    app.state.maintenance_tasks = [
+        asyncio.create_task(
+            run_periodically(settings.LOAN_STATUS_REFRESH_SECONDS, db_utils.refresh_loan_latest_status)
+        ),
+        asyncio.create_task(
+            run_periodically(
+                settings.LOAN_HISTORY_PARTITION_CHECK_SECONDS, db_utils.ensure_loan_history_partitions
+            )
+        ),
+    ]
+
+
+@app.on_event("shutdown")
+async def stop_database_maintenance():
+    """Cancel background database maintenance."""
+    for task in getattr(app.state, "maintenance_tasks", []):
+        task.cancel()
+    app.state.maintenance_tasks = []
+
 # Include routers
 app.include_router(customer_router, prefix="/api/v1/customers", tags=["customers"])
 app.include_router(loan_router, prefix="/api/v1/loans", tags=["loans"])
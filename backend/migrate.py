@@ -11,28 +11,62 @@ import os
 from pathlib import Path
 
 def run_command(command, description):
-    """Run a shell command and handle errors."""
+    """Run a command (argv list, no shell) and handle errors."""
     print(f"\n🔄 {description}...")
+    # Stream output line by line instead of buffering it all in memory
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout)
-        print(f"✅ {description} completed successfully!")
-        return True
-    except subprocess.CalledProcessError as e:
+        proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+    except FileNotFoundError:
+        print(f"❌ {description} failed! Command not found: {command[0]}")
+        return False
+    for line in proc.stdout:
+        print(line, end="")
+    proc.wait()
+    
+    if proc.returncode != 0:
+        print(f"❌ {description} failed!")
+        return False
+    print(f"✅ {description} completed successfully!")
+    return True
+
+def run_alembic_in_process(argv, description):
+    """
+    Run an alembic command inside this interpreter and handle errors.
+    
+    Falls back to the alembic executable in a subprocess when alembic
+    cannot be imported here.
+    """
+    try:
+        from alembic.config import main as alembic_main
+    except ImportError:
+        return run_command([alembic_executable(), *argv], description)
+    
+    print(f"\n🔄 {description}...")
+    try:
+        alembic_main(argv=argv)
+    except SystemExit as e:
+        if e.code:
+            print(f"❌ {description} failed!")
+            return False
+    except Exception as e:
         print(f"❌ {description} failed!")
-        if e.stdout:
-            print("STDOUT:", e.stdout)
-        if e.stderr:
-            print("STDERR:", e.stderr)
+        print("ERROR:", e)
         return False
+    print(f"✅ {description} completed successfully!")
+    return True
 
-def activate_venv():
-    """Activate virtual environment if it exists."""
-    venv_path = Path("venv/bin/activate")
-    if venv_path.exists():
-        return "source venv/bin/activate && "
-    return ""
+def alembic_executable():
+    """Return the virtual environment's alembic if it exists, else the one on PATH."""
+    venv_alembic = Path("venv/bin/alembic")
+    if venv_alembic.exists():
+        return str(venv_alembic)
+    return "alembic"
 
 def main():
     """Main migration management function."""
@@ -60,11 +94,11 @@ Examples:
         return
 
     command = sys.argv[1].lower()
-    venv_prefix = activate_venv()
+    alembic = alembic_executable()
 
     if command == "init":
         print("🚀 Initializing database with all tables...")
-        if run_command(f"{venv_prefix}alembic upgrade head", "Database initialization"):
+        if run_command([alembic, "upgrade", "head"], "Database initialization"):
             print("\n✅ Database is ready! All tables have been created.")
         else:
             print("\n❌ Database initialization failed. Check your database connection.")
@@ -77,30 +111,31 @@ Examples:
         
         message = sys.argv[2]
         run_command(
-            f"{venv_prefix}alembic revision --autogenerate -m \"{message}\"",
+            [alembic, "revision", "--autogenerate", "-m", message],
             f"Creating migration: {message}"
         )
 
     elif command == "upgrade":
-        run_command(f"{venv_prefix}alembic upgrade head", "Applying migrations")
+        run_command([alembic, "upgrade", "head"], "Applying migrations")
 
     elif command == "downgrade":
         print("⚠️  This will rollback the last migration. Are you sure? (y/N)")
         if input().lower() == 'y':
-            run_command(f"{venv_prefix}alembic downgrade -1", "Rolling back last migration")
+            run_command([alembic, "downgrade", "-1"], "Rolling back last migration")
         else:
             print("Migration rollback cancelled.")
 
     elif command == "current":
-        run_command(f"{venv_prefix}alembic current", "Checking current migration version")
+        run_command([alembic, "current"], "Checking current migration version")
 
     elif command == "history":
-        run_command(f"{venv_prefix}alembic history", "Showing migration history")
+        run_command([alembic, "history"], "Showing migration history")
 
     elif command == "status":
         print("📊 Database Status:")
-        run_command(f"{venv_prefix}alembic current", "Current version")
-        run_command(f"{venv_prefix}alembic heads", "Latest available version")
+        # Both queries share one interpreter, so alembic and env.py imports happen once
+        run_alembic_in_process(["current"], "Current version")
+        run_alembic_in_process(["heads"], "Latest available version")
 
     else:
         print(f"❌ Unknown command: {command}")
@@ -6,56 +6,62 @@ Provides different test execution modes and comprehensive reporting.
 """
 
 import argparse
-import subprocess
 import sys
-import os
 from pathlib import Path
 
+BACKEND_DIR = Path(__file__).resolve().parent
+INTEGRATION_DIR = BACKEND_DIR / "tests" / "integration"
 
-def run_tests(test_type="all", verbose=True, markers=None, output_file=None):
+
+def run_tests(test_type="all", verbose=True, markers=None, output_file=None, parallel=True):
     """Run integration tests with specified parameters."""
     
-    # Base pytest command
-    cmd = ["python", "-m", "pytest"]
+    # Arguments for pytest.main; paths are absolute so the caller's cwd is irrelevant
+    args = ["--rootdir", str(BACKEND_DIR), "-c", str(BACKEND_DIR / "pytest.ini")]
     
     # Add test paths based on type
     if test_type == "all":
-        cmd.append("tests/integration/")
+        test_files = [""]
     elif test_type == "workflow":
-        cmd.extend([
-            "tests/integration/test_loan_origination_workflow.py",
-            "tests/integration/test_customer_mastery_lifecycle.py",
-            "tests/integration/test_compliance_rule_enforcement.py"
-        ])
+        test_files = [
+            "test_loan_origination_workflow.py",
+            "test_customer_mastery_lifecycle.py",
+            "test_compliance_rule_enforcement.py"
+        ]
     elif test_type == "cross_domain":
-        cmd.append("tests/integration/test_cross_domain_integration.py")
+        test_files = ["test_cross_domain_integration.py"]
     elif test_type == "utilities":
-        cmd.append("tests/integration/test_data_utilities.py")
+        test_files = ["test_data_utilities.py"]
     else:
-        cmd.append(f"tests/integration/{test_type}")
+        test_files = [test_type]
+    args.extend(str(INTEGRATION_DIR / test_file) for test_file in test_files)
     
     # Add markers if specified
     if markers:
-        cmd.extend(["-m", markers])
+        args.extend(["-m", markers])
     
     # Add verbosity
     if verbose:
-        cmd.append("-v")
+        args.append("-v")
     
     # Add output options
-    cmd.extend(["--tb=short", "--strict-markers"])
+    args.extend(["--tb=short", "--strict-markers"])
+    
+    # Spread test files across workers (loadfile keeps each file's fixtures on one worker)
+    if parallel:
+        args.extend(["-n", "auto", "--dist=loadfile"])
     
     # Add output file if specified
     if output_file:
-        cmd.extend(["--junitxml", output_file])
+        args.extend(["--junitxml", output_file])
     
-    print(f"Running command: {' '.join(cmd)}")
+    print(f"Running command: pytest {' '.join(args)}")
     print("-" * 50)
     
-    # Execute tests
+    # Execute tests in this interpreter rather than a second Python process
     try:
-        result = subprocess.run(cmd, cwd=Path(__file__).parent)
-        return result.returncode
+        import pytest
+        return int(pytest.main(args))
     except KeyboardInterrupt:
         print("\nTest execution interrupted by user")
         return 130
@@ -92,6 +98,13 @@ def main():
         help="Run tests in quiet mode"
     )
     
+    parser.add_argument(
+        "--no-parallel",
+        dest="parallel",
+        action="store_false",
+        help="Run tests serially instead of across pytest-xdist workers"
+    )
+    
     parser.add_argument(
         "--list-tests",
         action="store_true",
@@ -119,7 +132,8 @@ def main():
         test_type=args.type,
         verbose=not args.quiet,
         markers=args.markers,
-        output_file=args.output
+        output_file=args.output,
+        parallel=args.parallel
     )
     
     if return_code == 0:
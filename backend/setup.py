@@ -15,9 +15,12 @@ setup(
         "sqlalchemy",
         "pydantic",
         "structlog",
+        "orjson",
+        "cachetools",
         "tenacity",
         "pytest",
         "pytest-asyncio",
         "pytest-mock",
+        "pytest-xdist",
     ],
 )
\ No newline at end of file
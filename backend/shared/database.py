@@ -5,14 +5,18 @@ This module provides SQLAlchemy ORM models for Customer, LoanApplication, Actor,
 and ComplianceEvent entities, along with database session management and utilities.
 """
 
+import functools
 import logging
-from datetime import datetime
+import threading
+from datetime import date, datetime
 from typing import List, Optional, Dict, Any, Union, Tuple
 from contextlib import contextmanager
+from dataclasses import dataclass, fields
 from enum import Enum
 
 from sqlalchemy import (
     create_engine, 
+    event,
     Column, 
     Integer, 
     String, 
@@ -23,19 +27,66 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Index,
-    text
+    text,
+    tuple_,
+    select,
+    bindparam,
+    insert,
+    update,
+    literal,
+    func
 )
+from cachetools import TTLCache
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
+from sqlalchemy.orm import sessionmaker, Session, relationship, joinedload
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.expression import FunctionElement
 import structlog
 
 from .config import settings
 
 logger = structlog.get_logger(__name__)
 
+
+class utcnow(FunctionElement):
+    """Current UTC time evaluated by the database, for column defaults."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', STATEMENT_TIMESTAMP())"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has second precision on SQLite; pad the
+    # milliseconds to the microsecond text form SQLAlchemy binds, so stored
+    # and bound values compare correctly as strings.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+# Stored as pre-parsed JSONB on PostgreSQL; plain JSON elsewhere (SQLite).
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class _ModelBase:
+    # Read server-generated timestamps back with RETURNING during the flush,
+    # so detached objects still carry them.
+    __mapper_args__ = {"eager_defaults": True}
+
+
 # SQLAlchemy base class
-Base = declarative_base()
+Base = declarative_base(cls=_ModelBase)
 
 
 class ActorModel(Base):
@@ -49,10 +100,10 @@ class ActorModel(Base):
     actor_name = Column(String(255), nullable=False)
     role = Column(String(100), nullable=False)  # Underwriter, Introducer, etc.
     blockchain_identity = Column(String(255), nullable=True)  # x.509 Certificate ID
-    permissions = Column(JSON, nullable=True)  # List of permission strings
+    permissions = Column(JSONType, nullable=True)  # List of permission strings
     is_active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
     
     # Relationships - removed back_populates to avoid ambiguous foreign keys
     customers = relationship("CustomerModel", foreign_keys="CustomerModel.created_by_actor_id")
@@ -85,11 +136,11 @@ class CustomerModel(Base):
     contact_phone = Column(String(50), nullable=True)
     kyc_status = Column(String(50), nullable=False, default='PENDING')  # PENDING, VERIFIED, FAILED
     aml_status = Column(String(50), nullable=False, default='PENDING')  # PENDING, CLEAR, FLAGGED
-    consent_preferences = Column(JSON, nullable=True)  # Consent data
+    consent_preferences = Column(JSONType, nullable=True)  # Consent data
     blockchain_record_hash = Column(String(255), nullable=True)  # Hash of blockchain record
     created_by_actor_id = Column(Integer, ForeignKey('actors.id'), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
     
     # Relationships
     created_by_actor = relationship("ActorModel", foreign_keys=[created_by_actor_id])
@@ -120,7 +171,7 @@ class CustomerHistoryModel(Base):
     new_value = Column(Text, nullable=True)
     changed_by_actor_id = Column(Integer, ForeignKey('actors.id'), nullable=False)
     blockchain_transaction_id = Column(String(255), nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime, server_default=utcnow(), nullable=False)
     
     # Relationships
     customer = relationship("CustomerModel", back_populates="customer_history")
@@ -128,7 +179,7 @@ class CustomerHistoryModel(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_customer_history_customer', 'customer_id'),
+        Index('idx_customer_history_customer_ts', 'customer_id', text('timestamp DESC')),
         Index('idx_customer_history_timestamp', 'timestamp'),
     )
     
@@ -144,7 +195,7 @@ class LoanApplicationModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     loan_application_id = Column(String(255), unique=True, index=True, nullable=False)
     customer_id = Column(Integer, ForeignKey('customers.id'), nullable=False)
-    application_date = Column(DateTime, default=datetime.utcnow, nullable=False)
+    application_date = Column(DateTime, server_default=utcnow(), nullable=False)
     requested_amount = Column(Float, nullable=False)
     loan_type = Column(String(100), nullable=False)  # PERSONAL, MORTGAGE, BUSINESS, etc.
     application_status = Column(String(50), nullable=False, default='SUBMITTED')  # SUBMITTED, UNDERWRITING, APPROVED, REJECTED, DISBURSED
@@ -154,8 +205,8 @@ class LoanApplicationModel(Base):
     rejection_reason = Column(Text, nullable=True)
     blockchain_record_hash = Column(String(255), nullable=True)  # Hash of blockchain record
     created_by_actor_id = Column(Integer, ForeignKey('actors.id'), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
     
     # Relationships
     customer = relationship("CustomerModel")
@@ -177,7 +228,13 @@ class LoanApplicationModel(Base):
 
 
 class LoanApplicationHistoryModel(Base):
-    """Loan application history model for tracking changes."""
+    """
+    Loan application history model for tracking changes.
+    
+    On PostgreSQL the table is range-partitioned by month on ``timestamp``
+    (see the a9e4c7f2b6d8 migration), with ``(id, timestamp)`` as its
+    primary key there.
+    """
     
     __tablename__ = "loan_application_history"
     
@@ -191,7 +248,7 @@ class LoanApplicationHistoryModel(Base):
     new_value = Column(Text, nullable=True)
     changed_by_actor_id = Column(Integer, ForeignKey('actors.id'), nullable=False)
     blockchain_transaction_id = Column(String(255), nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime, server_default=utcnow(), nullable=False)
     notes = Column(Text, nullable=True)  # Additional notes about the change
     
     # Relationships
@@ -200,7 +257,7 @@ class LoanApplicationHistoryModel(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_loan_history_loan', 'loan_application_id'),
+        Index('idx_loan_history_loan_ts', 'loan_application_id', text('timestamp DESC')),
         Index('idx_loan_history_timestamp', 'timestamp'),
         Index('idx_loan_history_status', 'new_status'),
     )
@@ -225,8 +282,8 @@ class LoanDocumentModel(Base):
     verification_status = Column(String(50), nullable=False, default='PENDING')  # PENDING, VERIFIED, FAILED
     uploaded_by_actor_id = Column(Integer, ForeignKey('actors.id'), nullable=False)
     blockchain_record_hash = Column(String(255), nullable=True)  # Hash of blockchain record
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
     
     # Relationships
     loan_application = relationship("LoanApplicationModel", back_populates="loan_documents")
@@ -257,7 +314,7 @@ class ComplianceEventModel(Base):
     affected_entity_id = Column(String(255), nullable=False)  # ID of affected entity
     severity = Column(String(20), nullable=False, default='INFO')  # INFO, WARNING, ERROR, CRITICAL
     description = Column(Text, nullable=False)
-    details = Column(JSON, nullable=True)  # Additional event details
+    details = Column(JSONType, nullable=True)  # Additional event details
     is_alerted = Column(Boolean, default=False, nullable=False)
     acknowledged_by_actor_id = Column(Integer, ForeignKey('actors.id'), nullable=True)
     acknowledged_at = Column(DateTime, nullable=True)
@@ -265,7 +322,7 @@ class ComplianceEventModel(Base):
     resolution_notes = Column(Text, nullable=True)
     actor_id = Column(Integer, ForeignKey('actors.id'), nullable=False)  # Actor who triggered the event
     blockchain_transaction_id = Column(String(255), nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime, server_default=utcnow(), nullable=False)
     
     # Relationships
     actor = relationship("ActorModel", foreign_keys=[actor_id])
@@ -274,7 +331,12 @@ class ComplianceEventModel(Base):
     # Indexes
     __table_args__ = (
         Index('idx_compliance_event_type', 'event_type'),
-        Index('idx_compliance_entity', 'affected_entity_type', 'affected_entity_id'),
+        Index(
+            'idx_compliance_entity_ts',
+            'affected_entity_type',
+            'affected_entity_id',
+            text('timestamp DESC'),
+        ),
         Index('idx_compliance_severity', 'severity'),
         Index('idx_compliance_timestamp', 'timestamp'),
         Index('idx_compliance_resolution', 'resolution_status'),
@@ -284,6 +346,150 @@ class ComplianceEventModel(Base):
         return f"<ComplianceEventModel(event_id='{self.event_id}', type='{self.event_type}')>"
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL so pooled SQLite connections can read concurrently."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+    finally:
+        cursor.close()
+
+
+# Prebuilt statements for hot single-entity lookups. Parameters are bound at
+# execution time, so SQLAlchemy's compiled cache reuses one compiled form.
+_ACTOR_BY_ID_STMT = select(ActorModel).where(
+    ActorModel.actor_id == bindparam("actor_id")
+)
+_CUSTOMER_BY_ID_STMT = select(CustomerModel).where(
+    CustomerModel.customer_id == bindparam("customer_id")
+)
+_LOAN_BY_ID_STMT = select(LoanApplicationModel).where(
+    LoanApplicationModel.loan_application_id == bindparam("loan_application_id")
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _loan_with_customer_stmt():
+    """
+    Loan lookup that eager-loads its customer, built on first use.
+    
+    Loader options configure the mappers, so building this at import time
+    would run mapper configuration before every model module is loaded.
+    """
+    return _LOAN_BY_ID_STMT.options(joinedload(LoanApplicationModel.customer))
+
+
+# History lookups resolve the parent's primary key in a scalar subquery so
+# the read is a single round-trip.
+_LOAN_HISTORY_STMT = select(LoanApplicationHistoryModel).where(
+    LoanApplicationHistoryModel.loan_application_id == select(LoanApplicationModel.id).where(
+        LoanApplicationModel.loan_application_id == bindparam("loan_application_id")
+    ).scalar_subquery()
+).order_by(LoanApplicationHistoryModel.timestamp.desc())
+_CUSTOMER_HISTORY_STMT = select(CustomerHistoryModel).where(
+    CustomerHistoryModel.customer_id == select(CustomerModel.id).where(
+        CustomerModel.customer_id == bindparam("customer_id")
+    ).scalar_subquery()
+).order_by(CustomerHistoryModel.timestamp.desc())
+
+
+@dataclass
+class ComplianceEventDTO:
+    """Read-only compliance event row returned by list queries."""
+    # Explicit slots rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = (
+        "id", "event_id", "event_type", "rule_id", "affected_entity_type",
+        "affected_entity_id", "severity", "is_alerted", "acknowledged_by_actor_id",
+        "acknowledged_at", "resolution_status", "actor_id", "blockchain_transaction_id",
+        "timestamp",
+    )
+    id: int
+    event_id: str
+    event_type: str
+    rule_id: Optional[str]
+    affected_entity_type: str
+    affected_entity_id: str
+    severity: str
+    is_alerted: bool
+    acknowledged_by_actor_id: Optional[int]
+    acknowledged_at: Optional[datetime]
+    resolution_status: str
+    actor_id: int
+    blockchain_transaction_id: Optional[str]
+    timestamp: datetime
+
+
+# Compliance events for an entity, newest first. Only the DTO columns are
+# selected (no ORM instances, no large free-text/JSON columns), and rows are
+# streamed in batches (a named cursor on psycopg2) rather than buffered
+# client-side all at once.
+_COMPLIANCE_EVENTS_BY_ENTITY_STMT = select(
+    *(getattr(ComplianceEventModel, field.name) for field in fields(ComplianceEventDTO))
+).where(
+    ComplianceEventModel.affected_entity_type == bindparam("entity_type"),
+    ComplianceEventModel.affected_entity_id == bindparam("entity_id")
+).order_by(
+    ComplianceEventModel.timestamp.desc()
+).limit(
+    bindparam("limit")
+).execution_options(yield_per=200, stream_results=True)
+_COMPLIANCE_EVENT_BY_ID_STMT = select(ComplianceEventModel).where(
+    ComplianceEventModel.event_id == bindparam("event_id")
+)
+
+# Latest status per loan. PostgreSQL reads the loan_latest_status_mv read model
+# (see the c4d2a9e1f7b3 migration); other backends compute it from the tables.
+_LATEST_STATUS_MV_STMT = text(
+    "SELECT loan_application_id, application_status, last_change "
+    "FROM loan_latest_status_mv WHERE loan_application_id = :loan_application_id"
+)
+_LATEST_STATUS_STMT = select(
+    LoanApplicationModel.loan_application_id,
+    LoanApplicationModel.application_status,
+    select(func.max(LoanApplicationHistoryModel.timestamp)).where(
+        LoanApplicationHistoryModel.loan_application_id == LoanApplicationModel.id
+    ).scalar_subquery().label("last_change")
+).where(
+    LoanApplicationModel.loan_application_id == bindparam("loan_application_id")
+)
+_REFRESH_LATEST_STATUS_MV_STMT = text(
+    "REFRESH MATERIALIZED VIEW CONCURRENTLY loan_latest_status_mv"
+)
+_CREATE_LOAN_HISTORY_PARTITION_STMT = text(
+    "SELECT create_loan_history_partition(:month)"
+)
+
+# Status change as two Core statements: the history row copies the current
+# status server-side (locking the loan row), then the loan itself is updated
+_RECORD_STATUS_CHANGE_STMT = insert(LoanApplicationHistoryModel.__table__).from_select(
+    [
+        "loan_application_id",
+        "change_type",
+        "previous_status",
+        "new_status",
+        "changed_by_actor_id",
+        "notes",
+    ],
+    select(
+        LoanApplicationModel.id,
+        literal("STATUS_CHANGE", String),
+        LoanApplicationModel.application_status,
+        bindparam("status_to", type_=String),
+        bindparam("changed_by", type_=Integer),
+        bindparam("change_notes", type_=Text),
+    ).where(
+        LoanApplicationModel.loan_application_id == bindparam("loan_ref")
+    ).with_for_update()
+)
+_SET_LOAN_STATUS_STMT = update(LoanApplicationModel.__table__).where(
+    LoanApplicationModel.loan_application_id == bindparam("loan_ref")
+).values(
+    application_status=bindparam("status_to")
+)
+
+
 class DatabaseManager:
     """Database connection and session management."""
     
@@ -300,20 +506,43 @@ class DatabaseManager:
             # Create engine with connection pooling
             if "sqlite" in self.database_url:
                 # SQLite specific configuration
-                self.engine = create_engine(
-                    self.database_url,
-                    poolclass=StaticPool,
-                    connect_args={"check_same_thread": False},
-                    echo=False  # Set to True for SQL debugging
-                )
+                sqlite_file = make_url(self.database_url).database not in (None, "", ":memory:")
+                if sqlite_file and not settings.DATABASE_SQLITE_STATIC_POOL:
+                    # Pooled file database in WAL mode: readers no longer
+                    # serialize on a single shared connection
+                    self.engine = create_engine(
+                        self.database_url,
+                        pool_size=settings.DATABASE_SQLITE_POOL_SIZE,
+                        connect_args={"check_same_thread": False},
+                        echo=False  # Set to True for SQL debugging
+                    )
+                    event.listen(self.engine, "connect", _set_sqlite_pragmas)
+                else:
+                    # In-memory databases only exist on one connection
+                    self.engine = create_engine(
+                        self.database_url,
+                        poolclass=StaticPool,
+                        connect_args={"check_same_thread": False},
+                        echo=False  # Set to True for SQL debugging
+                    )
             else:
                 # PostgreSQL configuration
+                engine_options = {}
+                if make_url(self.database_url).get_driver_name() == "psycopg2":
+                    # Multi-row VALUES for INSERT executemany, execute_batch
+                    # for UPDATE/DELETE executemany
+                    engine_options["executemany_mode"] = "values_plus_batch"
                 self.engine = create_engine(
                     self.database_url,
-                    pool_size=10,
-                    max_overflow=20,
-                    pool_pre_ping=True,
-                    echo=False  # Set to True for SQL debugging
+                    pool_size=settings.DATABASE_POOL_SIZE,
+                    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+                    # Recycle connections before server/NAT idle timeouts
+                    # instead of pinging on every checkout; health_check()
+                    # covers liveness
+                    pool_pre_ping=False,
+                    pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
+                    echo=False,  # Set to True for SQL debugging
+                    **engine_options
                 )
             
             # Create session factory
@@ -383,29 +612,60 @@ class DatabaseUtilities:
     def __init__(self, db_manager: DatabaseManager):
         """Initialize database utilities."""
         self.db_manager = db_manager
+        # Detached actors by actor_id; actors change rarely but are resolved
+        # on nearly every write path
+        self._actor_cache: TTLCache = TTLCache(
+            maxsize=settings.ACTOR_CACHE_SIZE,
+            ttl=settings.ACTOR_CACHE_TTL_SECONDS
+        )
+        self._actor_cache_lock = threading.Lock()
     
     def get_actor_by_actor_id(self, actor_id: str) -> Optional[ActorModel]:
         """Get actor by actor_id."""
+        with self._actor_cache_lock:
+            actor = self._actor_cache.get(actor_id)
+        if actor is not None:
+            return actor
+        
         with self.db_manager.session_scope() as session:
-            actor = session.query(ActorModel).filter(
-                ActorModel.actor_id == actor_id
-            ).first()
+            actor = session.execute(
+                _ACTOR_BY_ID_STMT, {"actor_id": actor_id}
+            ).scalars().first()
             if actor:
-                # Load all attributes to avoid lazy loading issues
-                session.refresh(actor)
                 # Detach from session
                 session.expunge(actor)
-            return actor
+        
+        if actor is not None:
+            with self._actor_cache_lock:
+                self._actor_cache[actor_id] = actor
+        return actor
+    
+    def invalidate_actor(self, actor_id: str) -> None:
+        """Drop a cached actor so the next lookup reads the database."""
+        with self._actor_cache_lock:
+            self._actor_cache.pop(actor_id, None)
+    
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Provide one transaction for a multi-entity workflow.
+        
+        Pass the yielded session to the ``*_in`` methods; everything is
+        committed together on exit, and the created objects are detached
+        so they stay readable afterwards.
+        """
+        with self.db_manager.session_scope() as session:
+            yield session
+            session.flush()
+            session.expunge_all()
     
     def get_customer_by_customer_id(self, customer_id: str) -> Optional[CustomerModel]:
         """Get customer by customer_id."""
         with self.db_manager.session_scope() as session:
-            customer = session.query(CustomerModel).filter(
-                CustomerModel.customer_id == customer_id
-            ).first()
+            customer = session.execute(
+                _CUSTOMER_BY_ID_STMT, {"customer_id": customer_id}
+            ).scalars().first()
             if customer:
-                # Load all attributes to avoid lazy loading issues
-                session.refresh(customer)
                 # Detach from session
                 session.expunge(customer)
             return customer
@@ -413,15 +673,11 @@ class DatabaseUtilities:
     def get_loan_by_loan_id(self, loan_application_id: str) -> Optional[LoanApplicationModel]:
         """Get loan application by loan_application_id."""
         with self.db_manager.session_scope() as session:
-            loan = session.query(LoanApplicationModel).filter(
-                LoanApplicationModel.loan_application_id == loan_application_id
-            ).first()
+            # Load the customer in the same statement so it survives detaching
+            loan = session.execute(
+                _loan_with_customer_stmt(), {"loan_application_id": loan_application_id}
+            ).scalars().first()
             if loan:
-                # Load all attributes to avoid lazy loading issues
-                session.refresh(loan)
-                # Load customer relationship
-                if loan.customer:
-                    session.refresh(loan.customer)
                 # Detach from session
                 session.expunge_all()
             return loan
@@ -431,68 +687,148 @@ class DatabaseUtilities:
         entity_type: str, 
         entity_id: str,
         limit: int = 100
-    ) -> List[ComplianceEventModel]:
-        """Get compliance events for a specific entity."""
+    ) -> List[ComplianceEventDTO]:
+        """
+        Get compliance events for a specific entity.
+        
+        ``details``, ``description`` and ``resolution_notes`` are not part of
+        the returned rows; use ``get_compliance_event_detail`` when they are
+        needed.
+        """
         with self.db_manager.session_scope() as session:
-            events = session.query(ComplianceEventModel).filter(
-                ComplianceEventModel.affected_entity_type == entity_type,
-                ComplianceEventModel.affected_entity_id == entity_id
-            ).order_by(ComplianceEventModel.timestamp.desc()).limit(limit).all()
-            
-            # Detach all events from session
-            for event in events:
-                session.refresh(event)
-                session.expunge(event)
-            return events
+            result = session.execute(
+                _COMPLIANCE_EVENTS_BY_ENTITY_STMT,
+                {"entity_type": entity_type, "entity_id": entity_id, "limit": limit}
+            )
+            return [ComplianceEventDTO(*row) for row in result]
+    
+    def get_compliance_event_detail(self, event_id: str) -> Optional[ComplianceEventModel]:
+        """Get a single compliance event with all of its columns loaded."""
+        with self.db_manager.session_scope() as session:
+            compliance_event = session.execute(
+                _COMPLIANCE_EVENT_BY_ID_STMT, {"event_id": event_id}
+            ).scalars().first()
+            if compliance_event:
+                session.expunge(compliance_event)
+            return compliance_event
+    
+    def create_actor_in(self, session: Session, actor_data: Dict[str, Any]) -> ActorModel:
+        """Create a new actor in the caller's transaction."""
+        actor = ActorModel(**actor_data)
+        session.add(actor)
+        session.flush()  # Get the ID and column defaults
+        self.invalidate_actor(actor.actor_id)
+        return actor
     
     def create_actor(self, actor_data: Dict[str, Any]) -> ActorModel:
         """Create a new actor."""
         with self.db_manager.session_scope() as session:
-            actor = ActorModel(**actor_data)
-            session.add(actor)
-            session.flush()  # Get the ID
-            session.refresh(actor)  # Refresh to get all attributes
+            actor = self.create_actor_in(session, actor_data)
             # Detach from session to avoid DetachedInstanceError
             session.expunge(actor)
             return actor
     
+    def create_customer_in(self, session: Session, customer_data: Dict[str, Any]) -> CustomerModel:
+        """Create a new customer in the caller's transaction."""
+        customer = CustomerModel(**customer_data)
+        session.add(customer)
+        session.flush()  # Get the ID and column defaults
+        return customer
+    
     def create_customer(self, customer_data: Dict[str, Any]) -> CustomerModel:
         """Create a new customer."""
         with self.db_manager.session_scope() as session:
-            customer = CustomerModel(**customer_data)
-            session.add(customer)
-            session.flush()  # Get the ID
-            session.refresh(customer)  # Refresh to get all attributes
+            customer = self.create_customer_in(session, customer_data)
             # Detach from session to avoid DetachedInstanceError
             session.expunge(customer)
             return customer
     
+    def create_loan_application_in(
+        self, session: Session, loan_data: Dict[str, Any]
+    ) -> LoanApplicationModel:
+        """Create a new loan application in the caller's transaction."""
+        loan = LoanApplicationModel(**loan_data)
+        session.add(loan)
+        session.flush()  # Get the ID and column defaults
+        return loan
+    
     def create_loan_application(self, loan_data: Dict[str, Any]) -> LoanApplicationModel:
         """Create a new loan application."""
         with self.db_manager.session_scope() as session:
-            loan = LoanApplicationModel(**loan_data)
-            session.add(loan)
-            session.flush()  # Get the ID
-            session.refresh(loan)  # Refresh to get all attributes
-            
-            # Create a detached copy with all the data we need
-            loan_copy = LoanApplicationModel()
-            for key, value in loan.__dict__.items():
-                if not key.startswith('_'):
-                    setattr(loan_copy, key, value)
-            
-            return loan_copy
+            loan = self.create_loan_application_in(session, loan_data)
+            # Detach from session to avoid DetachedInstanceError
+            session.expunge(loan)
+            return loan
+    
+    def create_compliance_event_in(
+        self, session: Session, event_data: Dict[str, Any]
+    ) -> ComplianceEventModel:
+        """Create a new compliance event in the caller's transaction."""
+        compliance_event = ComplianceEventModel(**event_data)
+        session.add(compliance_event)
+        session.flush()  # Get the ID and column defaults
+        return compliance_event
     
     def create_compliance_event(self, event_data: Dict[str, Any]) -> ComplianceEventModel:
         """Create a new compliance event."""
         with self.db_manager.session_scope() as session:
-            event = ComplianceEventModel(**event_data)
-            session.add(event)
-            session.flush()  # Get the ID
-            session.refresh(event)  # Refresh to get all attributes
+            compliance_event = self.create_compliance_event_in(session, event_data)
             # Detach from session to avoid DetachedInstanceError
-            session.expunge(event)
-            return event
+            session.expunge(compliance_event)
+            return compliance_event
+    
+    def _bulk_insert(self, model: Any, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert many rows in one executemany and return their IDs in input order."""
+        if not rows:
+            return []
+        with self.db_manager.session_scope() as session:
+            result = session.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                rows
+            )
+            return list(result.scalars())
+    
+    def create_actors_bulk(self, actors_data: List[Dict[str, Any]]) -> List[int]:
+        """Create many actors in a single transaction and return their IDs."""
+        ids = self._bulk_insert(ActorModel, actors_data)
+        for actor_data in actors_data:
+            self.invalidate_actor(actor_data["actor_id"])
+        return ids
+    
+    def create_customers_bulk(self, customers_data: List[Dict[str, Any]]) -> List[int]:
+        """Create many customers in a single transaction and return their IDs."""
+        return self._bulk_insert(CustomerModel, customers_data)
+    
+    def create_loan_applications_bulk(self, loans_data: List[Dict[str, Any]]) -> List[int]:
+        """Create many loan applications in a single transaction and return their IDs."""
+        return self._bulk_insert(LoanApplicationModel, loans_data)
+    
+    def create_compliance_events_bulk(self, events_data: List[Dict[str, Any]]) -> List[int]:
+        """Create many compliance events in a single transaction and return their IDs."""
+        return self._bulk_insert(ComplianceEventModel, events_data)
+    
+    def update_loan_status_in(
+        self,
+        session: Session,
+        loan_application_id: str,
+        new_status: str,
+        changed_by_actor_id: int,
+        notes: Optional[str] = None
+    ) -> bool:
+        """Update loan status and create a history record in the caller's transaction."""
+        # Bind names must differ from the column names being written
+        params = {
+            "loan_ref": loan_application_id,
+            "status_to": new_status,
+            "changed_by": changed_by_actor_id,
+            "change_notes": notes,
+        }
+        # No history row means no such loan application
+        if session.execute(_RECORD_STATUS_CHANGE_STMT, params).rowcount == 0:
+            return False
+        
+        session.execute(_SET_LOAN_STATUS_STMT, params)
+        return True
     
     def update_loan_status(
         self, 
@@ -503,69 +839,87 @@ class DatabaseUtilities:
     ) -> bool:
         """Update loan application status and create history record."""
         with self.db_manager.session_scope() as session:
-            loan = session.query(LoanApplicationModel).filter(
-                LoanApplicationModel.loan_application_id == loan_application_id
-            ).first()
-            
-            if not loan:
-                return False
-            
-            old_status = loan.application_status
-            loan.application_status = new_status
-            loan.updated_at = datetime.utcnow()
-            
-            # Create history record
-            history = LoanApplicationHistoryModel(
-                loan_application_id=loan.id,
-                change_type='STATUS_CHANGE',
-                previous_status=old_status,
-                new_status=new_status,
-                changed_by_actor_id=changed_by_actor_id,
-                notes=notes
+            return self.update_loan_status_in(
+                session, loan_application_id, new_status, changed_by_actor_id, notes
             )
-            session.add(history)
-            
-            return True
     
     def get_loan_history(self, loan_application_id: str) -> List[LoanApplicationHistoryModel]:
         """Get loan application history."""
         with self.db_manager.session_scope() as session:
-            loan = session.query(LoanApplicationModel).filter(
-                LoanApplicationModel.loan_application_id == loan_application_id
-            ).first()
-            
-            if not loan:
-                return []
-            
-            history = session.query(LoanApplicationHistoryModel).filter(
-                LoanApplicationHistoryModel.loan_application_id == loan.id
-            ).order_by(LoanApplicationHistoryModel.timestamp.desc()).all()
+            history = session.execute(
+                _LOAN_HISTORY_STMT, {"loan_application_id": loan_application_id}
+            ).scalars().all()
             
             # Detach all history records from session
-            for record in history:
-                session.refresh(record)
-                session.expunge(record)
+            session.expunge_all()
             return history
     
+    def get_latest_loan_status(self, loan_application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a loan's current status and the time of its last history change.
+        
+        On PostgreSQL this reads loan_latest_status_mv, which is as fresh as
+        its last refresh_loan_latest_status() call (run periodically by the
+        app). Loans created since that refresh are read from the tables.
+        """
+        params = {"loan_application_id": loan_application_id}
+        with self.db_manager.session_scope() as session:
+            row = None
+            if session.get_bind().dialect.name == "postgresql":
+                row = session.execute(_LATEST_STATUS_MV_STMT, params).first()
+            if row is None:
+                row = session.execute(_LATEST_STATUS_STMT, params).first()
+            return dict(row._mapping) if row else None
+    
+    def refresh_loan_latest_status(self) -> None:
+        """Refresh the loan_latest_status_mv read model (PostgreSQL only)."""
+        with self.db_manager.session_scope() as session:
+            if session.get_bind().dialect.name == "postgresql":
+                session.execute(_REFRESH_LATEST_STATUS_MV_STMT)
+    
+    def ensure_loan_history_partitions(self, months_ahead: int = 3) -> None:
+        """
+        Create monthly loan history partitions through ``months_ahead`` months
+        from now (PostgreSQL only). The app runs this at startup and then
+        every LOAN_HISTORY_PARTITION_CHECK_SECONDS; rows that already landed
+        in the DEFAULT partition for a new month are moved into it.
+        """
+        today = date.today()
+        with self.db_manager.session_scope() as session:
+            if session.get_bind().dialect.name != "postgresql":
+                return
+            for offset in range(months_ahead + 1):
+                year, month_index = divmod(today.month - 1 + offset, 12)
+                session.execute(
+                    _CREATE_LOAN_HISTORY_PARTITION_STMT,
+                    {"month": date(today.year + year, month_index + 1, 1)}
+                )
+    
     def get_loan_history_paginated(
         self, 
         loan_application_id: str, 
         page: int, 
         page_size: int,
-        filter_criteria: Optional[Any] = None
-    ) -> tuple[List[LoanApplicationHistoryModel], int]:
-        """Get paginated loan application history with filtering."""
+        filter_criteria: Optional[Any] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        lookahead: bool = False
+    ) -> tuple[List[LoanApplicationHistoryModel], Optional[int]]:
+        """
+        Get paginated loan application history with filtering.
+        
+        When ``cursor`` is given as the ``(timestamp, id)`` of the last record
+        already seen, keyset pagination is used and ``page`` is ignored, so the
+        database never walks skipped rows with OFFSET. The total count is
+        skipped as well and returned as None, keeping each page O(page_size).
+        With ``lookahead`` one extra record past the page is returned so
+        callers can tell whether a following page exists.
+        """
         with self.db_manager.session_scope() as session:
-            loan = session.query(LoanApplicationModel).filter(
-                LoanApplicationModel.loan_application_id == loan_application_id
-            ).first()
-            
-            if not loan:
-                return [], 0
-            
-            # Build base query
+            # Resolve the loan's primary key inside the history query itself
             query = session.query(LoanApplicationHistoryModel).filter(
-                LoanApplicationHistoryModel.loan_application_id == loan.id
+                LoanApplicationHistoryModel.loan_application_id == select(LoanApplicationModel.id).where(
+                    LoanApplicationModel.loan_application_id == loan_application_id
+                ).scalar_subquery()
             )
             
             # Apply filters if provided
@@ -596,50 +950,56 @@ class DatabaseUtilities:
                         (LoanApplicationHistoryModel.new_status == filter_criteria.status)
                     )
             
-            # Get total count for pagination
-            total_count = query.count()
-            
-            # Apply pagination and ordering
-            offset = (page - 1) * page_size
-            history = query.order_by(
-                LoanApplicationHistoryModel.timestamp.desc()
-            ).offset(offset).limit(page_size).all()
+            # Apply pagination and ordering; only offset pages need the total
+            total_count = None
+            if cursor:
+                query = query.filter(
+                    tuple_(LoanApplicationHistoryModel.timestamp, LoanApplicationHistoryModel.id) <
+                    tuple_(*cursor)
+                ).order_by(
+                    LoanApplicationHistoryModel.timestamp.desc(),
+                    LoanApplicationHistoryModel.id.desc()
+                )
+            else:
+                total_count = query.count()
+                query = query.order_by(
+                    LoanApplicationHistoryModel.timestamp.desc(),
+                    LoanApplicationHistoryModel.id.desc()
+                ).offset((page - 1) * page_size)
+            history = query.limit(page_size + 1 if lookahead else page_size).all()
             
             # Detach all history records from session
-            for record in history:
-                session.refresh(record)
-                session.expunge(record)
+            session.expunge_all()
             
             return history, total_count
     
     def get_customer_history(self, customer_id: str) -> List[CustomerHistoryModel]:
         """Get customer history."""
         with self.db_manager.session_scope() as session:
-            customer = session.query(CustomerModel).filter(
-                CustomerModel.customer_id == customer_id
-            ).first()
-            
-            if not customer:
-                return []
-            
-            history = session.query(CustomerHistoryModel).filter(
-                CustomerHistoryModel.customer_id == customer.id
-            ).order_by(CustomerHistoryModel.timestamp.desc()).all()
+            history = session.execute(
+                _CUSTOMER_HISTORY_STMT, {"customer_id": customer_id}
+            ).scalars().all()
             
             # Detach all history records from session
-            for record in history:
-                session.refresh(record)
-                session.expunge(record)
+            session.expunge_all()
             return history
 
 
+    def create_loan_document_in(
+        self, session: Session, document_data: Dict[str, Any]
+    ) -> LoanDocumentModel:
+        """Create a new loan document in the caller's transaction."""
+        document = LoanDocumentModel(**document_data)
+        session.add(document)
+        session.flush()  # Get the ID and column defaults
+        return document
+    
     def create_loan_document(self, document_data: Dict[str, Any]) -> LoanDocumentModel:
         """Create a new loan document."""
         with self.db_manager.session_scope() as session:
-            document = LoanDocumentModel(**document_data)
-            session.add(document)
-            session.flush()  # Get the ID
-            session.refresh(document)
+            document = self.create_loan_document_in(session, document_data)
+            # Detach from session so callers can read it after the commit
+            session.expunge(document)
             return document
     
     def get_loan_documents(self, loan_application_id: str) -> List[LoanDocumentModel]:
@@ -657,14 +1017,44 @@ class DatabaseUtilities:
                 LoanDocumentModel.loan_application_id == loan.id
             ).order_by(LoanDocumentModel.created_at.desc()).all()
             
+            # Detach from session
+            session.expunge_all()
             return documents
     
+    def get_loan_and_document(
+        self,
+        loan_application_id: str,
+        document_id: int
+    ) -> Optional[Tuple[LoanApplicationModel, LoanDocumentModel]]:
+        """
+        Get a loan application and one of its documents in a single query.
+        
+        Returns None when either row is missing or the document belongs to
+        a different loan application.
+        """
+        with self.db_manager.session_scope() as session:
+            row = session.query(LoanApplicationModel, LoanDocumentModel).join(
+                LoanDocumentModel,
+                LoanDocumentModel.loan_application_id == LoanApplicationModel.id
+            ).filter(
+                LoanApplicationModel.loan_application_id == loan_application_id,
+                LoanDocumentModel.id == document_id
+            ).one_or_none()
+            if row is None:
+                return None
+            # Detach from session
+            session.expunge_all()
+            return row[0], row[1]
+    
     def get_loan_document_by_id(self, document_id: int) -> Optional[LoanDocumentModel]:
         """Get a loan document by ID."""
         with self.db_manager.session_scope() as session:
             document = session.query(LoanDocumentModel).filter(
                 LoanDocumentModel.id == document_id
             ).first()
+            if document:
+                # Detach from session
+                session.expunge(document)
             return document
     
     def update_document_verification_status(
@@ -685,7 +1075,6 @@ class DatabaseUtilities:
             document.verification_status = verification_status
             if blockchain_record_hash:
                 document.blockchain_record_hash = blockchain_record_hash
-            document.updated_at = datetime.utcnow()
             
             return True
 
@@ -6,20 +6,60 @@ chaincode, including connection management, transaction invocation, and query op
 """
 
 import asyncio
-import json
+import functools
+import hashlib
+import itertools
 import logging
-from typing import Any, Dict, List, Optional, Union
-from contextlib import asynccontextmanager
-from dataclasses import dataclass
+import os
+import random
+import struct
+from collections import deque
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, fields
 from enum import Enum
 
+import orjson
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from cachetools import LRUCache, TTLCache
 
 from .config import settings
 
 logger = structlog.get_logger(__name__)
 
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_SECONDS = 0.05
+_RETRY_MAX_SECONDS = 1.0
+
+# Fabric proposals and responses are typically well under 64KB
+_BUFFER_SIZE = 64 * 1024
+_BUFFER_POOL_CAPACITY = 128
+
+
+def _retry_on(*exception_types: type):
+    """
+    Retry a coroutine method on the given exceptions, re-raising the last one.
+    
+    Full-jitter exponential backoff: sleep uniform(0, min(1s, 50ms * 2**retry)).
+    Randomizing the whole interval keeps clients that failed together (e.g. on
+    an MVCC conflict) from retrying in lockstep. A plain loop keeps the
+    first-attempt success path free of per-call retry bookkeeping.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(_RETRY_ATTEMPTS):
+                try:
+                    return await func(*args, **kwargs)
+                except exception_types:
+                    if attempt == _RETRY_ATTEMPTS - 1:
+                        raise
+                await asyncio.sleep(
+                    random.uniform(0, min(_RETRY_MAX_SECONDS, _RETRY_BASE_SECONDS * 2 ** attempt))
+                )
+        return wrapper
+    return decorator
+
 
 class FabricError(Exception):
     """Base exception for Fabric-related errors."""
@@ -48,9 +88,54 @@ class ChaincodeType(Enum):
     COMPLIANCE = "compliance"
 
 
-@dataclass
-class FabricConfig:
-    """Configuration for Fabric Gateway connection."""
+class _ResultMapping:
+    """Read-only mapping access for result objects, for dict-style callers."""
+    __slots__ = ()
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the field value, or ``default`` for unknown keys."""
+        return getattr(self, key) if key in self.__slots__ else default
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dictionary."""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+@dataclass(frozen=True)
+class TxResult(_ResultMapping):
+    """Outcome of a submitted transaction."""
+    # Explicit slots rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("transaction_id", "status", "payload", "timestamp")
+    transaction_id: str
+    status: str
+    payload: Any
+    timestamp: str
+
+
+@dataclass(frozen=True)
+class QueryResult(_ResultMapping):
+    """Outcome of a read-only chaincode query."""
+    __slots__ = ("status", "payload", "timestamp")
+    status: str
+    payload: Any
+    timestamp: str
+
+
+class FabricConfig(NamedTuple):
+    """
+    Configuration for Fabric Gateway connection.
+    
+    An immutable, hashable NamedTuple without a per-instance __dict__; derive
+    variants with ``_replace``.
+    """
     gateway_endpoint: str
     msp_id: str
     channel_name: str
@@ -59,6 +144,15 @@ class FabricConfig:
     admin_cert_path: str
     admin_key_path: str
     ca_cert_path: str
+    channel_pool_size: int = 4
+    identity_cache_size: int = 1024
+    query_cache_size: int = 10_000
+    query_cache_ttl_seconds: float = 2.0
+    ledger_cache_size: int = 10_000
+    block_height_poll_ms: int = 500
+    max_requests_per_batch: int = 40
+    max_batch_wait_ms: float = 2.0
+    keepalive_interval_seconds: float = 20.0
     
     @classmethod
     def from_settings(cls) -> "FabricConfig":
@@ -72,22 +166,137 @@ class FabricConfig:
             admin_cert_path=getattr(settings, 'FABRIC_ADMIN_CERT_PATH', './crypto/admin.pem'),
             admin_key_path=getattr(settings, 'FABRIC_ADMIN_KEY_PATH', './crypto/admin-key.pem'),
             ca_cert_path=getattr(settings, 'FABRIC_CA_CERT_PATH', './crypto/ca.pem'),
+            channel_pool_size=settings.FABRIC_CHANNEL_POOL_SIZE,
+            identity_cache_size=settings.FABRIC_IDENTITY_CACHE_SIZE,
+            query_cache_size=settings.FABRIC_QUERY_CACHE_SIZE,
+            query_cache_ttl_seconds=settings.FABRIC_QUERY_CACHE_TTL_SECONDS,
+            ledger_cache_size=settings.FABRIC_LEDGER_CACHE_SIZE,
+            block_height_poll_ms=settings.FABRIC_BLOCK_HEIGHT_POLL_MS,
+            max_requests_per_batch=settings.FABRIC_MAX_REQUESTS_PER_BATCH,
+            max_batch_wait_ms=settings.FABRIC_MAX_BATCH_WAIT_MS,
+            keepalive_interval_seconds=settings.FABRIC_KEEPALIVE_INTERVAL_SECONDS,
         )
 
 
+# (chaincode_name, function_name, args) for one proposal in a batch
+ChaincodeCall = Tuple[str, str, List[str]]
+
+
+class ChannelPool:
+    """
+    Fixed-size set of independent channels to the gateway peer.
+    
+    Each channel has its own TCP connection, and RPCs are spread across them
+    round-robin so concurrent calls are not serialized behind one HTTP/2
+    connection's flow-control window.
+    """
+    
+    def __init__(self, endpoint: str, size: int):
+        """Initialize an unopened pool of ``size`` channels to ``endpoint``."""
+        self.endpoint = endpoint
+        self.size = max(1, size)
+        self.channels: List[Any] = []
+        self._next = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self.channels)
+    
+    def open(self) -> None:
+        """Open every channel in the pool."""
+        self.channels = [self._open_channel(index) for index in range(self.size)]
+    
+    def close(self) -> None:
+        """Close every channel in the pool."""
+        self.channels.clear()
+    
+    def next_channel(self) -> Any:
+        """Return the next channel in round-robin order."""
+        return self.channels[next(self._next) % len(self.channels)]
+    
+    def _open_channel(self, index: int) -> Any:
+        """Open a single channel with its own subchannel (TCP connection)."""
+        # Note: This is a placeholder for actual channel creation
+        # In a real implementation, you would create
+        # grpc.aio.secure_channel(self.endpoint, credentials,
+        #     options=[("grpc.use_local_subchannel_pool", 1)])
+        # so that each channel gets a separate TCP connection. HTTP/2
+        # keepalive (grpc.keepalive_time_ms) is left off on every channel;
+        # the gateway's single keepalive task pings them all instead
+        return {"endpoint": self.endpoint, "index": index}
+
+
+class BufferPool:
+    """
+    LIFO pool of reusable bytearrays for proposal and response bytes.
+    
+    Buffers keep their full capacity while pooled, so steady-state calls
+    write into existing memory instead of allocating a new object each time.
+    Only used from the event loop thread, so no locking is needed.
+    """
+    
+    def __init__(self, capacity: int = _BUFFER_POOL_CAPACITY, buffer_size: int = _BUFFER_SIZE):
+        """Initialize an empty pool holding at most ``capacity`` buffers."""
+        self.capacity = capacity
+        self.buffer_size = buffer_size
+        self._buffers: deque = deque(maxlen=capacity)
+    
+    def __len__(self) -> int:
+        return len(self._buffers)
+    
+    def acquire(self, min_size: int) -> bytearray:
+        """Return a buffer of at least ``min_size`` bytes."""
+        while self._buffers:
+            buffer = self._buffers.pop()
+            if len(buffer) >= min_size:
+                return buffer
+        return bytearray(max(min_size, self.buffer_size))
+    
+    def release(self, buffer: bytearray) -> None:
+        """Return ``buffer`` to the pool; oversized buffers are dropped."""
+        if len(buffer) <= self.buffer_size and len(self._buffers) < self.capacity:
+            self._buffers.append(buffer)
+
+
 class FabricGateway:
     """
     High-level wrapper for Hyperledger Fabric Gateway operations.
     
     Provides connection management, transaction invocation, and query capabilities
     with built-in error handling, retry logic, and connection pooling.
+    
+    Concurrent queries are coalesced: calls arriving within
+    ``max_batch_wait_ms`` of each other (up to ``max_requests_per_batch``)
+    are evaluated together in one batched round-trip.
     """
     
     def __init__(self, config: Optional[FabricConfig] = None):
         """Initialize Fabric Gateway with configuration."""
         self.config = config or FabricConfig.from_settings()
-        self._connection_pool: Dict[str, Any] = {}
+        self._connection_pool = ChannelPool(
+            self.config.gateway_endpoint, self.config.channel_pool_size
+        )
         self._is_connected = False
+        self._pending_queries: List[Tuple[ChaincodeCall, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()
+        # Deserialized, MSP-validated identities keyed by a digest of their bytes
+        self._identity_cache: LRUCache = LRUCache(maxsize=self.config.identity_cache_size)
+        self._signing_identity: Optional[bytes] = None
+        # Serialized channel/signature header prefix per (chaincode, channel)
+        self._header_templates: Dict[Tuple[str, str], bytes] = {}
+        self._buffer_pool = BufferPool()
+        self.identity_cache_hits = 0
+        self.identity_cache_misses = 0
+        # Query results are keyed on the committed block height, so a new
+        # block implicitly invalidates them; committed transactions and blocks
+        # never change and are kept until evicted.
+        self._query_cache: TTLCache = TTLCache(
+            maxsize=self.config.query_cache_size, ttl=self.config.query_cache_ttl_seconds
+        )
+        self._ledger_cache: LRUCache = LRUCache(maxsize=self.config.ledger_cache_size)
+        self._committed_block_height = 0
+        self._block_height_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
         
     async def connect(self) -> None:
         """
@@ -99,11 +308,21 @@ class FabricGateway:
         try:
             logger.info("Connecting to Fabric network", 
                        endpoint=self.config.gateway_endpoint,
-                       msp_id=self.config.msp_id)
+                       msp_id=self.config.msp_id,
+                       channels=self._connection_pool.size)
             
             # Note: This is a placeholder for actual Fabric SDK connection
             # In a real implementation, you would use the Fabric Python SDK
-            # to establish the connection here
+            # to establish the connection here, with the admin certificate
+            # PEM read from admin_cert_path as the signing identity
+            self._connection_pool.open()
+            self._signing_identity = f"{self.config.msp_id}:{self.config.admin_cert_path}".encode()
+            self._get_identity(self._signing_identity)
+            
+            if self.config.block_height_poll_ms > 0:
+                self._block_height_task = asyncio.ensure_future(self._poll_block_height())
+            if self.config.keepalive_interval_seconds > 0:
+                self._keepalive_task = asyncio.ensure_future(self._keepalive())
             
             self._is_connected = True
             logger.info("Successfully connected to Fabric network")
@@ -117,8 +336,22 @@ class FabricGateway:
         try:
             logger.info("Disconnecting from Fabric network")
             
-            # Cleanup connection pool
-            self._connection_pool.clear()
+            if self._block_height_task is not None:
+                self._block_height_task.cancel()
+                self._block_height_task = None
+            if self._keepalive_task is not None:
+                self._keepalive_task.cancel()
+                self._keepalive_task = None
+            
+            # Fail queries still waiting for a batch, then cleanup connection pool
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            pending, self._pending_queries = self._pending_queries, []
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(ConnectionError("Disconnected from Fabric network"))
+            self._connection_pool.close()
             self._is_connected = False
             
             logger.info("Successfully disconnected from Fabric network")
@@ -126,23 +359,146 @@ class FabricGateway:
         except Exception as e:
             logger.error("Error during disconnect", error=str(e))
     
+    def _get_identity(self, serialized_identity: bytes) -> Tuple[Any, str]:
+        """
+        Return the deserialized identity and its MSP ID, validating it only
+        the first time the serialized bytes are seen.
+        """
+        key = hashlib.blake2b(serialized_identity, digest_size=16).digest()
+        identity = self._identity_cache.get(key)
+        if identity is not None:
+            self.identity_cache_hits += 1
+            return identity
+        
+        self.identity_cache_misses += 1
+        # Note: This is a placeholder for actual identity deserialization
+        # In a real implementation, you would parse the certificate with
+        # x509.load_pem_x509_certificate and validate it against the MSP
+        identity = (serialized_identity, self.config.msp_id)
+        self._identity_cache[key] = identity
+        return identity
+    
+    async def _poll_block_height(self) -> None:
+        """Track the committed block height so stale query results stop matching."""
+        interval = self.config.block_height_poll_ms / 1000
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                height = await self._fetch_block_height()
+            except Exception as e:
+                logger.warning("Failed to poll block height", error=str(e))
+                continue
+            if height > self._committed_block_height:
+                self._committed_block_height = height
+    
+    async def _fetch_block_height(self) -> int:
+        """Return the channel's current committed block height."""
+        # Note: This is a placeholder for actual chain info retrieval
+        # In a real implementation, you would query the channel's
+        # blockchain info (qscc GetChainInfo) for its height
+        return self._committed_block_height
+    
+    async def _keepalive(self) -> None:
+        """
+        Ping every pooled channel on one shared timer.
+        
+        Replaces per-channel HTTP/2 keepalive timers, so an idle pool wakes
+        the event loop once per interval while each TCP connection still
+        sees traffic often enough for middleboxes not to drop it.
+        """
+        while True:
+            await asyncio.sleep(self.config.keepalive_interval_seconds)
+            results = await asyncio.gather(
+                *(self._ping_channel(channel) for channel in self._connection_pool.channels),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning("Failed to ping Fabric channel", error=str(result))
+    
+    async def _ping_channel(self, channel: Any) -> None:
+        """Send a lightweight request over ``channel`` to keep it alive."""
+        # Note: This is a placeholder for an actual ping
+        # In a real implementation, you would issue a cheap unary RPC
+        # (e.g. a gateway Evaluate of a no-op) directly on ``channel``,
+        # bypassing the query cache and batching
+        return None
+    
+    def invalidate_identities(self) -> None:
+        """Drop cached identities, e.g. after a CRL or MSP configuration refresh."""
+        self._identity_cache.clear()
+        self._header_templates.clear()
+    
+    def _header_template(self, chaincode_name: str) -> bytes:
+        """Return the static header bytes shared by every proposal to a chaincode."""
+        key = (chaincode_name, self.config.channel_name)
+        template = self._header_templates.get(key)
+        if template is None:
+            # Note: This is a placeholder for the serialized ChannelHeader and
+            # SignatureHeader fields that do not change between transactions
+            template = bytearray()
+            for field in (self.config.channel_name.encode(), chaincode_name.encode(), self._signing_identity):
+                template.extend(len(field).to_bytes(4, "big"))
+                template.extend(field)
+            template = self._header_templates[key] = bytes(template)
+        return template
+    
+    @contextmanager
+    def _build_proposal(
+        self, chaincode_name: str, function_name: str, args: List[str]
+    ) -> Iterator[Tuple[str, memoryview]]:
+        """
+        Build a proposal by splicing the per-transaction fields onto the
+        cached header template, in a buffer borrowed from the buffer pool.
+        
+        Yields the transaction ID and a view of the proposal bytes; the view
+        is only valid inside the ``with`` block, after which the buffer is
+        returned to the pool.
+        """
+        nonce = os.urandom(24)
+        # Fabric transaction IDs are the hex SHA-256 of nonce || creator
+        transaction_id = hashlib.sha256(nonce + self._signing_identity).hexdigest()
+        
+        template = self._header_template(chaincode_name)
+        encoded_id = transaction_id.encode()
+        encoded_fields = [field.encode() for field in (function_name, *args)]
+        size = (
+            len(template) + len(nonce) + len(encoded_id)
+            + sum(4 + len(encoded) for encoded in encoded_fields)
+        )
+        
+        # Write each piece straight into the pooled buffer; the only fresh
+        # allocations are the nonce, the transaction ID and the encoded args
+        buffer = self._buffer_pool.acquire(size)
+        offset = 0
+        for fixed in (template, nonce, encoded_id):
+            buffer[offset:offset + len(fixed)] = fixed
+            offset += len(fixed)
+        for encoded in encoded_fields:
+            struct.pack_into(">I", buffer, offset, len(encoded))
+            offset += 4
+            buffer[offset:offset + len(encoded)] = encoded
+            offset += len(encoded)
+        view = memoryview(buffer)[:size]
+        try:
+            yield transaction_id, view
+        finally:
+            view.release()
+            self._buffer_pool.release(buffer)
+    
     def _ensure_connected(self) -> None:
         """Ensure connection is established."""
         if not self._is_connected:
             raise ConnectionError("Not connected to Fabric network. Call connect() first.")
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((ConnectionError, TransactionError))
-    )
+    @_retry_on(ConnectionError, TransactionError)
     async def invoke_chaincode(
         self,
         chaincode_name: str,
         function_name: str,
         args: List[str],
         transient_data: Optional[Dict[str, bytes]] = None
-    ) -> Dict[str, Any]:
+    ) -> TxResult:
         """
         Invoke a chaincode function that modifies the ledger.
         
@@ -160,59 +516,43 @@ class FabricGateway:
             ConnectionError: If connection is lost
         """
         self._ensure_connected()
+        log = logger.bind(chaincode=chaincode_name, function=function_name)
         
         try:
-            logger.info("Invoking chaincode function",
-                       chaincode=chaincode_name,
-                       function=function_name,
-                       args_count=len(args))
+            log.info("Invoking chaincode function", args_count=len(args))
             
-            # Note: This is a placeholder for actual chaincode invocation
-            # In a real implementation, you would use the Fabric SDK to:
-            # 1. Create a transaction proposal
-            # 2. Send to endorsing peers
-            # 3. Collect endorsements
-            # 4. Submit to orderer
-            # 5. Wait for commit
-            
-            # Simulate successful transaction
-            result = {
-                "transaction_id": f"tx_{chaincode_name}_{function_name}",
-                "status": "SUCCESS",
-                "payload": {},
-                "timestamp": "2024-01-01T00:00:00Z"
-            }
+            result = (await self._submit_batch([
+                await self._endorse((chaincode_name, function_name, args), transient_data)
+            ]))[0]
+            # Our own commit changed ledger state; don't serve older reads
+            self._query_cache.clear()
             
-            logger.info("Chaincode invocation successful",
-                       transaction_id=result["transaction_id"])
+            log.info("Chaincode invocation successful", transaction_id=result["transaction_id"])
             
             return result
             
         except Exception as e:
-            logger.error("Chaincode invocation failed",
-                        chaincode=chaincode_name,
-                        function=function_name,
-                        error=str(e))
+            log.error("Chaincode invocation failed", error=str(e))
             raise TransactionError(f"Failed to invoke {chaincode_name}.{function_name}: {e}")
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=8),
-        retry=retry_if_exception_type((ConnectionError, QueryError))
-    )
+    @_retry_on(ConnectionError, QueryError)
     async def query_chaincode(
         self,
         chaincode_name: str,
         function_name: str,
-        args: List[str]
-    ) -> Dict[str, Any]:
+        args: List[str],
+        consistent: bool = False
+    ) -> QueryResult:
         """
         Query a chaincode function that reads from the ledger.
         
+        Results are cached per committed block height for a short TTL.
+        
         Args:
             chaincode_name: Name of the chaincode to query
             function_name: Function name to call
             args: List of string arguments for the function
+            consistent: Bypass the result cache and always ask a peer
             
         Returns:
             Query result as dictionary
@@ -223,36 +563,184 @@ class FabricGateway:
         """
         self._ensure_connected()
         
+        cache_key = (chaincode_name, function_name, tuple(args), self._committed_block_height)
+        if not consistent:
+            result = self._query_cache.get(cache_key)
+            if result is not None:
+                return result
+        
+        log = logger.bind(chaincode=chaincode_name, function=function_name)
         try:
-            logger.info("Querying chaincode function",
-                       chaincode=chaincode_name,
-                       function=function_name,
-                       args_count=len(args))
+            log.info("Querying chaincode function", args_count=len(args))
             
-            # Note: This is a placeholder for actual chaincode query
-            # In a real implementation, you would use the Fabric SDK to:
-            # 1. Create a query proposal
-            # 2. Send to a peer
-            # 3. Return the result
+            result = await self._coalesce_query((chaincode_name, function_name, args))
+            self._query_cache[cache_key] = result
             
-            # Simulate successful query
-            result = {
-                "status": "SUCCESS",
-                "payload": {},
-                "timestamp": "2024-01-01T00:00:00Z"
-            }
-            
-            logger.info("Chaincode query successful")
+            log.info("Chaincode query successful")
             
             return result
             
         except Exception as e:
-            logger.error("Chaincode query failed",
-                        chaincode=chaincode_name,
-                        function=function_name,
-                        error=str(e))
+            log.error("Chaincode query failed", error=str(e))
             raise QueryError(f"Failed to query {chaincode_name}.{function_name}: {e}")
     
+    async def query_many(self, calls: List[ChaincodeCall]) -> List[QueryResult]:
+        """
+        Evaluate several read-only chaincode calls in one batched round-trip.
+        
+        Args:
+            calls: ``(chaincode_name, function_name, args)`` tuples
+            
+        Returns:
+            Query results in the same order as ``calls``
+            
+        Raises:
+            QueryError: If the batch fails
+            ConnectionError: If connection is lost
+        """
+        self._ensure_connected()
+        if not calls:
+            return []
+        
+        try:
+            logger.info("Querying chaincode batch", batch_size=len(calls))
+            return await self._evaluate_batch(calls)
+            
+        except Exception as e:
+            logger.error("Chaincode batch query failed", batch_size=len(calls), error=str(e))
+            raise QueryError(f"Failed to query chaincode batch: {e}")
+    
+    async def invoke_many(
+        self,
+        calls: List[ChaincodeCall],
+        transient_data: Optional[Dict[str, bytes]] = None
+    ) -> List[TxResult]:
+        """
+        Endorse several transactions in parallel and submit them together.
+        
+        Args:
+            calls: ``(chaincode_name, function_name, args)`` tuples
+            transient_data: Optional transient data applied to every proposal
+            
+        Returns:
+            Transaction results in the same order as ``calls``
+            
+        Raises:
+            TransactionError: If any endorsement or the submission fails
+            ConnectionError: If connection is lost
+        """
+        self._ensure_connected()
+        if not calls:
+            return []
+        
+        try:
+            logger.info("Invoking chaincode batch", batch_size=len(calls))
+            endorsed = await asyncio.gather(
+                *(self._endorse(call, transient_data) for call in calls)
+            )
+            results = await self._submit_batch(endorsed)
+            self._query_cache.clear()
+            return results
+            
+        except Exception as e:
+            logger.error("Chaincode batch invocation failed", batch_size=len(calls), error=str(e))
+            raise TransactionError(f"Failed to invoke chaincode batch: {e}")
+    
+    async def _coalesce_query(self, call: ChaincodeCall) -> QueryResult:
+        """Queue a query for the next batch and wait for its slot in the response."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_queries.append((call, future))
+        
+        if len(self._pending_queries) >= self.config.max_requests_per_batch:
+            self._flush_queries()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.config.max_batch_wait_ms / 1000, self._flush_queries
+            )
+        return await future
+    
+    def _flush_queries(self) -> None:
+        """Send all queued queries as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending_queries = self._pending_queries, []
+        if batch:
+            # Keep a reference so the task is not garbage collected mid-flight
+            task = asyncio.ensure_future(self._run_query_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_query_batch(self, batch: List[Tuple[ChaincodeCall, asyncio.Future]]) -> None:
+        """Evaluate a batch and resolve each caller's future with its result."""
+        try:
+            results = await self._evaluate_batch([call for call, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _evaluate_batch(self, calls: List[ChaincodeCall]) -> List[QueryResult]:
+        """Evaluate query proposals in a single multiplexed request."""
+        channel = self._connection_pool.next_channel()
+        # Note: This is a placeholder for actual chaincode queries
+        # In a real implementation, you would use the Fabric SDK to:
+        # 1. Create a query proposal per call
+        # 2. Send them to a peer over ``channel`` in one batched evaluate request
+        # 3. Return the results in request order
+        
+        # Simulate successful queries
+        return [
+            QueryResult(status="SUCCESS", payload={}, timestamp="2024-01-01T00:00:00Z")
+            for _ in calls
+        ]
+    
+    async def _endorse(
+        self,
+        call: ChaincodeCall,
+        transient_data: Optional[Dict[str, bytes]] = None
+    ) -> Dict[str, Any]:
+        """Create a transaction proposal and collect its endorsements."""
+        chaincode_name, function_name, args = call
+        channel = self._connection_pool.next_channel()
+        creator, msp_id = self._get_identity(self._signing_identity)
+        with self._build_proposal(chaincode_name, function_name, args) as (transaction_id, proposal):
+            # Note: This is a placeholder for actual endorsement
+            # In a real implementation, you would use the Fabric SDK to:
+            # 1. Sign ``proposal`` as ``creator``
+            # 2. Send the memoryview to endorsing peers over ``channel``
+            # 3. Collect endorsements
+            return {
+                "transaction_id": transaction_id,
+                "chaincode_name": chaincode_name,
+                "function_name": function_name,
+                "creator_msp_id": msp_id,
+            }
+    
+    async def _submit_batch(self, endorsed: List[Dict[str, Any]]) -> List[TxResult]:
+        """Submit endorsed transactions to the orderer together and wait for commit."""
+        channel = self._connection_pool.next_channel()
+        # Note: This is a placeholder for actual submission
+        # In a real implementation, you would use the Fabric SDK to:
+        # 1. Submit the endorsed transactions to the orderer over ``channel``
+        # 2. Wait for commit
+        
+        # Simulate successful transactions
+        return [
+            TxResult(
+                transaction_id=transaction["transaction_id"],
+                status="SUCCESS",
+                payload={},
+                timestamp="2024-01-01T00:00:00Z"
+            )
+            for transaction in endorsed
+        ]
+    
     async def get_transaction_by_id(self, transaction_id: str) -> Dict[str, Any]:
         """
         Retrieve transaction details by transaction ID.
@@ -268,6 +756,11 @@ class FabricGateway:
         """
         self._ensure_connected()
         
+        cache_key = ("transaction", transaction_id)
+        result = self._ledger_cache.get(cache_key)
+        if result is not None:
+            return result
+        
         try:
             logger.info("Retrieving transaction", transaction_id=transaction_id)
             
@@ -282,6 +775,9 @@ class FabricGateway:
                 "args": []
             }
             
+            # Only committed transactions are immutable
+            if result["status"] == "VALID":
+                self._ledger_cache[cache_key] = result
             return result
             
         except Exception as e:
@@ -305,6 +801,11 @@ class FabricGateway:
         """
         self._ensure_connected()
         
+        cache_key = ("block", block_number)
+        result = self._ledger_cache.get(cache_key)
+        if result is not None:
+            return result
+        
         try:
             logger.info("Retrieving block", block_number=block_number)
             
@@ -317,6 +818,7 @@ class FabricGateway:
                 "timestamp": "2024-01-01T00:00:00Z"
             }
             
+            self._ledger_cache[cache_key] = result
             return result
             
         except Exception as e:
@@ -350,7 +852,7 @@ class ChaincodeClient:
         Returns:
             Creation result
         """
-        args = [json.dumps(entity_data)]
+        args = [orjson.dumps(entity_data).decode()]
         return await self.gateway.invoke_chaincode(
             self.chaincode_name,
             "CreateEntity",
@@ -368,7 +870,7 @@ class ChaincodeClient:
         Returns:
             Update result
         """
-        args = [entity_id, json.dumps(entity_data)]
+        args = [entity_id, orjson.dumps(entity_data).decode()]
         return await self.gateway.invoke_chaincode(
             self.chaincode_name,
             "UpdateEntity",
@@ -409,32 +911,55 @@ class ChaincodeClient:
             "GetEntityHistory",
             args
         )
-        # Ensure we return a list even if payload is empty or not a list
-        payload = result.get("payload", [])
-        return payload if isinstance(payload, list) else []
+        # Ensure we return a list even if payload is missing or not a list;
+        # chaincode payloads are decoded JSON, so an exact type check suffices
+        payload = result.get("payload")
+        return payload if type(payload) is list else []
 
 
 # Connection pool management
 _gateway_pool: Dict[str, FabricGateway] = {}
+_gateway_pool_lock: Optional[asyncio.Lock] = None
+# Gateway for the settings-derived config, the one nearly every caller uses
+_default_gateway: Optional[FabricGateway] = None
 
 
 async def get_fabric_gateway(config: Optional[FabricConfig] = None) -> FabricGateway:
     """
     Get or create a Fabric Gateway connection.
     
+    Connected gateways are cached per endpoint/MSP, so only the first call
+    for a given config pays the connection handshake; concurrent first
+    calls are serialized so a single connection is opened. Calls without a
+    config return the process-wide default gateway without a pool lookup.
+    
     Args:
         config: Optional configuration, uses default if not provided
         
     Returns:
         Connected FabricGateway instance
     """
-    config = config or FabricConfig.from_settings()
+    global _default_gateway, _gateway_pool_lock
+    if config is None:
+        if _default_gateway is not None:
+            return _default_gateway
+        _default_gateway = await get_fabric_gateway(FabricConfig.from_settings())
+        return _default_gateway
+    
     pool_key = f"{config.gateway_endpoint}_{config.msp_id}"
     
-    if pool_key not in _gateway_pool:
-        gateway = FabricGateway(config)
-        await gateway.connect()
-        _gateway_pool[pool_key] = gateway
+    gateway = _gateway_pool.get(pool_key)
+    if gateway is not None:
+        return gateway
+    
+    if _gateway_pool_lock is None:
+        _gateway_pool_lock = asyncio.Lock()
+    
+    async with _gateway_pool_lock:
+        if pool_key not in _gateway_pool:
+            gateway = FabricGateway(config)
+            await gateway.connect()
+            _gateway_pool[pool_key] = gateway
     
     return _gateway_pool[pool_key]
 
@@ -457,7 +982,16 @@ async def fabric_gateway_context(config: Optional[FabricConfig] = None):
 
 
 async def cleanup_gateway_pool():
-    """Cleanup all gateway connections in the pool."""
-    for gateway in _gateway_pool.values():
-        await gateway.disconnect()
-    _gateway_pool.clear()
\ No newline at end of file
+    """Cleanup all gateway connections in the pool, disconnecting them concurrently."""
+    global _default_gateway, _gateway_pool_lock
+    pool_keys = list(_gateway_pool)
+    results = await asyncio.gather(
+        *(gateway.disconnect() for gateway in _gateway_pool.values()),
+        return_exceptions=True
+    )
+    for pool_key, result in zip(pool_keys, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to disconnect gateway", pool_key=pool_key, error=str(result))
+    _gateway_pool.clear()
+    _gateway_pool_lock = None
+    _default_gateway = None
\ No newline at end of file
@@ -10,6 +10,15 @@ from io import BytesIO
 from shared.database import LoanApplicationModel, LoanApplicationHistoryModel, LoanDocumentModel
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_hash_cache():
+    """Keep cached document verifications from leaking between tests."""
+    from loan_origination.api import _verified_hash_cache
+    _verified_hash_cache.clear()
+    yield
+    _verified_hash_cache.clear()
+
+
 @pytest.fixture
 def loan_origination_mock_db_utils():
     """Mock database utilities specifically for loan origination tests."""
@@ -5,6 +5,7 @@ Tests cover CRUD operations, validation, error handling, and access control
 for loan application management functionality.
 """
 
+import functools
 import json
 import pytest
 from datetime import datetime
@@ -13,11 +14,23 @@ from fastapi.testclient import TestClient
 from fastapi import status
 
 from main import app
-from shared.auth import Actor, ActorType, Role, Permission, jwt_manager
+from shared.auth import Actor, ActorType, Role, Permission, actor_manager, jwt_manager
 from shared.database import LoanApplicationModel, CustomerModel, ActorModel, LoanApplicationHistoryModel
 from loan_origination.api import _generate_loan_application_id, ApplicationStatus, LoanType
 
 
+@functools.lru_cache(maxsize=256)
+def _cached_access_token(actor_id: str, role: Role, permissions: frozenset) -> str:
+    """Sign one token per actor identity; call cache_clear() after changing an actor."""
+    return jwt_manager.create_access_token(actor_manager.get_actor(actor_id))
+
+
+def _auth_headers(actor: Actor) -> dict:
+    """Build bearer headers for a registered actor."""
+    token = _cached_access_token(actor.actor_id, actor.role, frozenset(actor.permissions))
+    return {"Authorization": f"Bearer {token}"}
+
+
 @pytest.fixture
 def client():
     """Create test client."""
@@ -27,8 +40,6 @@ def client():
 @pytest.fixture
 def test_introducer():
     """Create test actor with loan creation permissions."""
-    from shared.auth import actor_manager
-    
     actor = Actor(
         actor_id="introducer_001",
         actor_type=ActorType.EXTERNAL_PARTNER,
@@ -41,17 +52,12 @@ def test_introducer():
         }
     )
     
-    # Add actor to the actor manager
-    actor_manager._actors[actor.actor_id] = actor
-    
-    return actor
+    return actor_manager.register(actor)
 
 
 @pytest.fixture
 def test_underwriter():
     """Create test actor with loan update permissions."""
-    from shared.auth import actor_manager
-    
     actor = Actor(
         actor_id="underwriter_001",
         actor_type=ActorType.INTERNAL_USER,
@@ -64,17 +70,12 @@ def test_underwriter():
         }
     )
     
-    # Add actor to the actor manager
-    actor_manager._actors[actor.actor_id] = actor
-    
-    return actor
+    return actor_manager.register(actor)
 
 
 @pytest.fixture
 def test_credit_officer():
     """Create test actor with approval permissions."""
-    from shared.auth import actor_manager
-    
     actor = Actor(
         actor_id="credit_officer_001",
         actor_type=ActorType.INTERNAL_USER,
@@ -88,31 +89,25 @@ def test_credit_officer():
         }
     )
     
-    # Add actor to the actor manager
-    actor_manager._actors[actor.actor_id] = actor
-    
-    return actor
+    return actor_manager.register(actor)
 
 
 @pytest.fixture
 def introducer_auth_headers(test_introducer):
     """Create authentication headers for introducer requests."""
-    token = jwt_manager.create_access_token(test_introducer)
-    return {"Authorization": f"Bearer {token}"}
+    return _auth_headers(test_introducer)
 
 
 @pytest.fixture
 def underwriter_auth_headers(test_underwriter):
     """Create authentication headers for underwriter requests."""
-    token = jwt_manager.create_access_token(test_underwriter)
-    return {"Authorization": f"Bearer {token}"}
+    return _auth_headers(test_underwriter)
 
 
 @pytest.fixture
 def credit_officer_auth_headers(test_credit_officer):
     """Create authentication headers for credit officer requests."""
-    token = jwt_manager.create_access_token(test_credit_officer)
-    return {"Authorization": f"Bearer {token}"}
+    return _auth_headers(test_credit_officer)
 
 
 @pytest.fixture
@@ -263,8 +258,6 @@ class TestLoanApplicationCreation:
     
     def test_submit_loan_application_insufficient_permissions(self, client, sample_loan_data):
         """Test loan application submission with insufficient permissions."""
-        from shared.auth import actor_manager
-        
         # Create actor without CREATE_LOAN_APPLICATION permission
         limited_actor = Actor(
             actor_id="limited_actor",
@@ -274,11 +267,8 @@ class TestLoanApplicationCreation:
             permissions={Permission.READ_LOAN_APPLICATION}  # Missing CREATE_LOAN_APPLICATION
         )
         
-        # Add actor to the actor manager
-        actor_manager._actors[limited_actor.actor_id] = limited_actor
-        
-        token = jwt_manager.create_access_token(limited_actor)
-        headers = {"Authorization": f"Bearer {token}"}
+        actor_manager.register(limited_actor)
+        headers = _auth_headers(limited_actor)
         
         response = client.post(
             "/api/v1/loans/",
@@ -721,7 +711,7 @@ class TestLoanHistory:
                 notes="Approved with conditions"
             )
         ]
-        mock_db_utils.get_loan_history.return_value = mock_history
+        mock_db_utils.get_loan_history_paginated.return_value = (mock_history, 2)
         
         response = client.get(
             "/api/v1/loans/LOAN_123456/history",
@@ -744,7 +734,8 @@ class TestLoanHistory:
         assert data["items"][0]["change_type"] == "STATUS_CHANGE"
         assert data["items"][1]["change_type"] == "APPROVAL"
         
-        mock_db_utils.get_loan_history.assert_called_once_with("LOAN_123456")
+        mock_db_utils.get_loan_history_paginated.assert_called_once()
+        assert mock_db_utils.get_loan_history_paginated.call_args.args[0] == "LOAN_123456"
     
     @patch('loan_origination.api.db_utils')
     def test_get_loan_history_not_found(self, mock_db_utils, client, underwriter_auth_headers):
@@ -852,6 +843,19 @@ class TestValidation:
         with pytest.raises(ValueError):
             LoanStatusUpdate(new_status="INVALID_STATUS")
     
+    def test_document_name_validation(self):
+        """Test document name validation."""
+        from loan_origination.models import DocumentUploadRequest
+        
+        request = DocumentUploadRequest(document_type="IDENTITY", document_name="  passport.pdf  ")
+        assert request.document_name == "passport.pdf"
+        
+        with pytest.raises(ValueError):
+            DocumentUploadRequest(document_type="IDENTITY", document_name="   ")
+        
+        with pytest.raises(ValueError):
+            DocumentUploadRequest(document_type="IDENTITY", document_name="a" * 256)
+    
     def test_required_fields(self):
         """Test required field validation."""
         from loan_origination.api import LoanApplicationCreate, LoanRejectionRequest
@@ -5,22 +5,64 @@ Tests document upload, retrieval, status updates, and hash verification
 functionality in the loan origination API.
 """
 
+import io
 import pytest
 import json
 import hashlib
 from datetime import datetime
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, patch
 from io import BytesIO
 
 from fastapi.testclient import TestClient
 from fastapi import FastAPI, UploadFile
+from sqlalchemy import inspect
 
 from loan_origination.api import router
-from shared.auth import Actor, ActorType, Role, Permission
+from shared.auth import get_current_user, Actor, ActorType, Role, Permission
 from shared.database import LoanApplicationModel, CustomerModel, LoanDocumentModel, ActorModel
 
 
-@pytest.fixture
+# Upload payloads are built once; BytesIO(bytes) shares the buffer until written
+_SMALL_PAYLOAD = b"test content"
+_LARGE_PAYLOAD_SIZE = 11 * 1024 * 1024  # 11MB, above the 10MB upload limit
+
+
+class _ZeroReader(io.RawIOBase):
+    """Unseekable stream of ``n`` zero bytes, produced per read so it is never held whole."""
+    
+    def __init__(self, n):
+        self.n = n
+    
+    def readable(self):
+        return True
+    
+    def read(self, size=-1):
+        take = self.n if size < 0 else min(size, self.n)
+        self.n -= take
+        return b"\0" * take
+
+
+class _FakeGateway:
+    """Minimal stand-in for the Fabric gateway's invoke_chaincode coroutine."""
+    
+    def __init__(self, ret=None, exc=None):
+        self.ret, self.exc = ret, exc
+        self.invoke_count = 0
+    
+    async def invoke_chaincode(self, *args, **kwargs):
+        self.invoke_count += 1
+        if self.exc:
+            raise self.exc
+        return self.ret
+
+
+def _copy_model(instance, **overrides):
+    """Copy a model's column values into a new instance, leaving shared fixtures untouched."""
+    values = {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+    return type(instance)(**{**values, **overrides})
+
+
+@pytest.fixture(scope="session")
 def mock_actor():
     """Create a mock actor for testing."""
     return Actor(
@@ -35,7 +77,7 @@ def mock_actor():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_loan():
     """Create a mock loan application."""
     return LoanApplicationModel(
@@ -52,7 +94,7 @@ def mock_loan():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_customer():
     """Create a mock customer."""
     return CustomerModel(
@@ -65,7 +107,7 @@ def mock_customer():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_document():
     """Create a mock loan document."""
     return LoanDocumentModel(
@@ -83,13 +125,19 @@ def mock_document():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_file_content():
     """Create sample file content for testing."""
     return b"This is a test document content for hashing"
 
 
 @pytest.fixture
+def sample_file_stream(sample_file_content):
+    """Sample file content as a stream, with its expected SHA256 digest."""
+    return BytesIO(sample_file_content), hashlib.sha256(sample_file_content).hexdigest()
+
+
+@pytest.fixture(scope="session")
 def test_app():
     """Create a test FastAPI app."""
     app = FastAPI()
@@ -97,17 +145,30 @@ def test_app():
     return app
 
 
+@pytest.fixture(scope="session")
+def client(test_app):
+    """Create one test client for the whole session."""
+    with TestClient(test_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def authenticated_actor(test_app, mock_actor):
+    """Resolve the current user, and so every permission dependency, to ``mock_actor``."""
+    test_app.dependency_overrides[get_current_user] = lambda: mock_actor
+    yield mock_actor
+    test_app.dependency_overrides.clear()
+
+
 class TestDocumentUpload:
     """Test document upload functionality."""
     
     @patch('loan_origination.api.db_utils')
     @patch('loan_origination.api.get_fabric_gateway')
-    @patch('loan_origination.api.require_permissions')
-    def test_upload_document_success(self, mock_require_permissions, mock_gateway, mock_db_utils, 
-                                   mock_actor, mock_loan, mock_customer, sample_file_content):
+    def test_upload_document_success(self, mock_gateway, mock_db_utils, 
+                                   mock_actor, mock_loan, mock_customer, sample_file_content, client):
         """Test successful document upload."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         mock_db_utils.get_customer_by_customer_id.return_value = mock_customer
         mock_db_utils.get_actor_by_actor_id.return_value = ActorModel(id=1, actor_id="TEST_ACTOR_001")
@@ -129,22 +190,19 @@ class TestDocumentUpload:
         mock_db_utils.create_loan_document.return_value = mock_document
         
         # Mock blockchain gateway
-        mock_gateway_instance = AsyncMock()
-        mock_gateway_instance.invoke_chaincode.return_value = {"transaction_id": "tx123"}
-        mock_gateway.return_value = mock_gateway_instance
+        mock_gateway.return_value = _FakeGateway(ret={"transaction_id": "tx123"})
         
         # Create test file
         file_data = BytesIO(sample_file_content)
         
-        with TestClient(router) as client:
-            response = client.post(
-                "/LOAN_TEST123/documents",
-                files={"file": ("test_document.pdf", file_data, "application/pdf")},
-                data={
-                    "document_type": "IDENTITY",
-                    "document_name": "test_document.pdf"
-                }
-            )
+        response = client.post(
+            "/loans/LOAN_TEST123/documents",
+            files={"file": ("test_document.pdf", file_data, "application/pdf")},
+            data={
+                "document_type": "IDENTITY",
+                "document_name": "test_document.pdf"
+            }
+        )
         
         assert response.status_code == 201
         response_data = response.json()
@@ -152,59 +210,58 @@ class TestDocumentUpload:
         assert response_data["document_name"] == "test_document.pdf"
         assert response_data["verification_status"] == "PENDING"
         assert "document_hash" in response_data
+        # The upload is hashed and measured by _calculate_file_hash
+        document_data = mock_db_utils.create_loan_document.call_args.args[0]
+        assert document_data["document_hash"] == hashlib.sha256(sample_file_content).hexdigest()
+        assert document_data["file_size"] == len(sample_file_content)
     
     @patch('loan_origination.api.db_utils')
-    @patch('loan_origination.api.require_permissions')
-    def test_upload_document_loan_not_found(self, mock_require_permissions, mock_db_utils, mock_actor):
+    def test_upload_document_loan_not_found(self, mock_db_utils, mock_actor, client):
         """Test document upload when loan doesn't exist."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = None
         
-        file_data = BytesIO(b"test content")
+        file_data = BytesIO(_SMALL_PAYLOAD)
         
-        with TestClient(router) as client:
-            response = client.post(
-                "/NONEXISTENT_LOAN/documents",
-                files={"file": ("test.pdf", file_data, "application/pdf")},
-                data={"document_type": "IDENTITY"}
-            )
+        response = client.post(
+            "/loans/NONEXISTENT_LOAN/documents",
+            files={"file": ("test.pdf", file_data, "application/pdf")},
+            data={"document_type": "IDENTITY"}
+        )
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
     
-    @patch('loan_origination.api.require_permissions')
-    def test_upload_document_file_too_large(self, mock_require_permissions, mock_actor):
+    @pytest.mark.slow
+    @patch('loan_origination.api.db_utils')
+    def test_upload_document_file_too_large(self, mock_db_utils, mock_loan, client):
         """Test document upload with file too large."""
-        mock_require_permissions.return_value = mock_actor
+        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         
-        # Create a large file (>10MB)
-        large_content = b"x" * (11 * 1024 * 1024)  # 11MB
-        file_data = BytesIO(large_content)
+        # Stream a large file (>10MB) without building it in memory
+        file_data = _ZeroReader(_LARGE_PAYLOAD_SIZE)
         
-        with TestClient(router) as client:
-            response = client.post(
-                "/LOAN_TEST123/documents",
-                files={"file": ("large_file.pdf", file_data, "application/pdf")},
-                data={"document_type": "IDENTITY"}
-            )
+        response = client.post(
+            "/loans/LOAN_TEST123/documents",
+            files={"file": ("large_file.pdf", file_data, "application/pdf")},
+            data={"document_type": "IDENTITY"}
+        )
         
         assert response.status_code == 413
         assert "exceeds" in response.json()["detail"].lower()
     
-    @patch('loan_origination.api.require_permissions')
-    def test_upload_document_invalid_file_type(self, mock_require_permissions, mock_actor):
+    @patch('loan_origination.api.db_utils')
+    def test_upload_document_invalid_file_type(self, mock_db_utils, mock_loan, client):
         """Test document upload with invalid file type."""
-        mock_require_permissions.return_value = mock_actor
+        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         
-        file_data = BytesIO(b"test content")
+        file_data = BytesIO(_SMALL_PAYLOAD)
         
-        with TestClient(router) as client:
-            response = client.post(
-                "/LOAN_TEST123/documents",
-                files={"file": ("test.exe", file_data, "application/x-executable")},
-                data={"document_type": "IDENTITY"}
-            )
+        response = client.post(
+            "/loans/LOAN_TEST123/documents",
+            files={"file": ("test.exe", file_data, "application/x-executable")},
+            data={"document_type": "IDENTITY"}
+        )
         
         assert response.status_code == 400
         assert "not allowed" in response.json()["detail"].lower()
@@ -214,17 +271,14 @@ class TestDocumentRetrieval:
     """Test document retrieval functionality."""
     
     @patch('loan_origination.api.db_utils')
-    @patch('loan_origination.api.require_permissions')
-    def test_get_loan_documents_success(self, mock_require_permissions, mock_db_utils, 
-                                      mock_actor, mock_loan, mock_document, test_app):
+    def test_get_loan_documents_success(self, mock_db_utils, 
+                                      mock_actor, mock_loan, mock_document, client):
         """Test successful document retrieval."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         mock_db_utils.get_loan_documents.return_value = [mock_document]
         
-        with TestClient(test_app) as client:
-            response = client.get("/loans/LOAN_TEST123/documents")
+        response = client.get("/loans/LOAN_TEST123/documents")
         
         assert response.status_code == 200
         response_data = response.json()
@@ -233,12 +287,10 @@ class TestDocumentRetrieval:
         assert response_data[0]["document_name"] == "passport.pdf"
     
     @patch('loan_origination.api.db_utils')
-    @patch('loan_origination.api.require_permissions')
-    def test_get_loan_documents_with_filters(self, mock_require_permissions, mock_db_utils, 
-                                           mock_actor, mock_loan):
+    def test_get_loan_documents_with_filters(self, mock_db_utils, 
+                                           mock_actor, mock_loan, client):
         """Test document retrieval with filters."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         
         # Create multiple documents with different types and statuses
@@ -258,33 +310,29 @@ class TestDocumentRetrieval:
         ]
         mock_db_utils.get_loan_documents.return_value = documents
         
-        with TestClient(router) as client:
-            # Test filter by document type
-            response = client.get("/LOAN_TEST123/documents?document_type=IDENTITY")
-            assert response.status_code == 200
-            response_data = response.json()
-            assert len(response_data) == 1
-            assert response_data[0]["document_type"] == "IDENTITY"
+        # Test filter by document type
+        response = client.get("/loans/LOAN_TEST123/documents?document_type=IDENTITY")
+        assert response.status_code == 200
+        response_data = response.json()
+        assert len(response_data) == 1
+        assert response_data[0]["document_type"] == "IDENTITY"
             
-            # Test filter by verification status
-            response = client.get("/LOAN_TEST123/documents?verification_status=VERIFIED")
-            assert response.status_code == 200
-            response_data = response.json()
-            assert len(response_data) == 1
-            assert response_data[0]["verification_status"] == "VERIFIED"
+        # Test filter by verification status
+        response = client.get("/loans/LOAN_TEST123/documents?verification_status=VERIFIED")
+        assert response.status_code == 200
+        response_data = response.json()
+        assert len(response_data) == 1
+        assert response_data[0]["verification_status"] == "VERIFIED"
     
     @patch('loan_origination.api.db_utils')
-    @patch('loan_origination.api.require_permissions')
-    def test_get_loan_documents_empty_result(self, mock_require_permissions, mock_db_utils, 
-                                           mock_actor, mock_loan):
+    def test_get_loan_documents_empty_result(self, mock_db_utils, 
+                                           mock_actor, mock_loan, client):
         """Test document retrieval with no documents."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         mock_db_utils.get_loan_documents.return_value = []
         
-        with TestClient(router) as client:
-            response = client.get("/LOAN_TEST123/documents")
+        response = client.get("/loans/LOAN_TEST123/documents")
         
         assert response.status_code == 200
         response_data = response.json()
@@ -296,77 +344,66 @@ class TestDocumentStatusUpdate:
     
     @patch('loan_origination.api.db_utils')
     @patch('loan_origination.api.get_fabric_gateway')
-    @patch('loan_origination.api.require_permissions')
-    def test_update_document_status_success(self, mock_require_permissions, mock_gateway, 
-                                          mock_db_utils, mock_actor, mock_loan, mock_document):
+    def test_update_document_status_success(self, mock_gateway, 
+                                          mock_db_utils, mock_actor, mock_loan, mock_document, client):
         """Test successful document status update."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
-        mock_db_utils.get_loan_document_by_id.return_value = mock_document
+        mock_db_utils.get_loan_and_document.return_value = (mock_loan, mock_document)
         mock_db_utils.update_document_verification_status.return_value = True
         
         # Mock updated document
-        updated_document = mock_document
-        updated_document.verification_status = "VERIFIED"
+        updated_document = _copy_model(mock_document, verification_status="VERIFIED")
         mock_db_utils.get_loan_document_by_id.return_value = updated_document
         
         # Mock blockchain gateway
-        mock_gateway_instance = AsyncMock()
-        mock_gateway_instance.invoke_chaincode.return_value = {"transaction_id": "tx123"}
-        mock_gateway.return_value = mock_gateway_instance
-        
-        with TestClient(router) as client:
-            response = client.put(
-                "/LOAN_TEST123/documents/1/status",
-                json={
-                    "verification_status": "VERIFIED",
-                    "notes": "Document verified successfully"
-                }
-            )
+        mock_gateway.return_value = _FakeGateway(ret={"transaction_id": "tx123"})
+        
+        response = client.put(
+            "/loans/LOAN_TEST123/documents/1/status",
+            json={
+                "verification_status": "VERIFIED",
+                "notes": "Document verified successfully"
+            }
+        )
         
         assert response.status_code == 200
         response_data = response.json()
         assert response_data["verification_status"] == "VERIFIED"
     
     @patch('loan_origination.api.db_utils')
-    @patch('loan_origination.api.require_permissions')
-    def test_update_document_status_document_not_found(self, mock_require_permissions, 
-                                                     mock_db_utils, mock_actor, mock_loan):
+    def test_update_document_status_document_not_found(self, 
+                                                     mock_db_utils, mock_actor, mock_loan, client):
         """Test document status update when document doesn't exist."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
+        mock_db_utils.get_loan_and_document.return_value = None
         mock_db_utils.get_loan_document_by_id.return_value = None
         
-        with TestClient(router) as client:
-            response = client.put(
-                "/LOAN_TEST123/documents/999/status",
-                json={"verification_status": "VERIFIED"}
-            )
+        response = client.put(
+            "/loans/LOAN_TEST123/documents/999/status",
+            json={"verification_status": "VERIFIED"}
+        )
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
     
     @patch('loan_origination.api.db_utils')
-    @patch('loan_origination.api.require_permissions')
-    def test_update_document_status_wrong_loan(self, mock_require_permissions, mock_db_utils, 
-                                             mock_actor, mock_loan, mock_document):
+    def test_update_document_status_wrong_loan(self, mock_db_utils, 
+                                             mock_actor, mock_loan, mock_document, client):
         """Test document status update when document belongs to different loan."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         
         # Document belongs to different loan
-        wrong_document = mock_document
-        wrong_document.loan_application_id = 999
+        wrong_document = _copy_model(mock_document, loan_application_id=999)
+        mock_db_utils.get_loan_and_document.return_value = None
         mock_db_utils.get_loan_document_by_id.return_value = wrong_document
         
-        with TestClient(router) as client:
-            response = client.put(
-                "/LOAN_TEST123/documents/1/status",
-                json={"verification_status": "VERIFIED"}
-            )
+        response = client.put(
+            "/loans/LOAN_TEST123/documents/1/status",
+            json={"verification_status": "VERIFIED"}
+        )
         
         assert response.status_code == 400
         assert "does not belong" in response.json()["detail"].lower()
@@ -377,27 +414,21 @@ class TestDocumentHashVerification:
     
     @patch('loan_origination.api.db_utils')
     @patch('loan_origination.api.get_fabric_gateway')
-    @patch('loan_origination.api.require_permissions')
-    def test_verify_document_hash_success(self, mock_require_permissions, mock_gateway, 
-                                        mock_db_utils, mock_actor, mock_loan, mock_document):
+    def test_verify_document_hash_success(self, mock_gateway, 
+                                        mock_db_utils, mock_actor, mock_loan, mock_document, client):
         """Test successful document hash verification."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
-        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
-        mock_db_utils.get_loan_document_by_id.return_value = mock_document
+        mock_db_utils.get_loan_and_document.return_value = (mock_loan, mock_document)
         
         # Mock blockchain gateway
-        mock_gateway_instance = AsyncMock()
-        mock_gateway_instance.invoke_chaincode.return_value = {
+        mock_gateway.return_value = _FakeGateway(ret={
             "success": True,
             "stored_hash": "abc123def456",
             "hash_match": True,
             "transaction_id": "tx123"
-        }
-        mock_gateway.return_value = mock_gateway_instance
+        })
         
-        with TestClient(router) as client:
-            response = client.post("/LOAN_TEST123/documents/1/verify")
+        response = client.post("/loans/LOAN_TEST123/documents/1/verify")
         
         assert response.status_code == 200
         response_data = response.json()
@@ -407,27 +438,21 @@ class TestDocumentHashVerification:
     
     @patch('loan_origination.api.db_utils')
     @patch('loan_origination.api.get_fabric_gateway')
-    @patch('loan_origination.api.require_permissions')
-    def test_verify_document_hash_mismatch(self, mock_require_permissions, mock_gateway, 
-                                         mock_db_utils, mock_actor, mock_loan, mock_document):
+    def test_verify_document_hash_mismatch(self, mock_gateway, 
+                                         mock_db_utils, mock_actor, mock_loan, mock_document, client):
         """Test document hash verification with hash mismatch."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
-        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
-        mock_db_utils.get_loan_document_by_id.return_value = mock_document
+        mock_db_utils.get_loan_and_document.return_value = (mock_loan, mock_document)
         
         # Mock blockchain gateway with hash mismatch
-        mock_gateway_instance = AsyncMock()
-        mock_gateway_instance.invoke_chaincode.return_value = {
+        mock_gateway.return_value = _FakeGateway(ret={
             "success": True,
             "stored_hash": "different_hash",
             "hash_match": False,
             "transaction_id": "tx123"
-        }
-        mock_gateway.return_value = mock_gateway_instance
+        })
         
-        with TestClient(router) as client:
-            response = client.post("/LOAN_TEST123/documents/1/verify")
+        response = client.post("/loans/LOAN_TEST123/documents/1/verify")
         
         assert response.status_code == 200
         response_data = response.json()
@@ -436,40 +461,76 @@ class TestDocumentHashVerification:
     
     @patch('loan_origination.api.db_utils')
     @patch('loan_origination.api.get_fabric_gateway')
-    @patch('loan_origination.api.require_permissions')
-    def test_verify_document_hash_blockchain_error(self, mock_require_permissions, mock_gateway, 
-                                                  mock_db_utils, mock_actor, mock_loan, mock_document):
+    def test_verify_document_hash_blockchain_error(self, mock_gateway, 
+                                                  mock_db_utils, mock_actor, mock_loan, mock_document, client):
         """Test document hash verification with blockchain error."""
         # Setup mocks
-        mock_require_permissions.return_value = mock_actor
-        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
-        mock_db_utils.get_loan_document_by_id.return_value = mock_document
+        mock_db_utils.get_loan_and_document.return_value = (mock_loan, mock_document)
         
         # Mock blockchain gateway with error
-        mock_gateway_instance = AsyncMock()
-        mock_gateway_instance.invoke_chaincode.side_effect = Exception("Blockchain connection failed")
-        mock_gateway.return_value = mock_gateway_instance
+        mock_gateway.return_value = _FakeGateway(exc=Exception("Blockchain connection failed"))
         
-        with TestClient(router) as client:
-            response = client.post("/LOAN_TEST123/documents/1/verify")
+        response = client.post("/loans/LOAN_TEST123/documents/1/verify")
         
         assert response.status_code == 200
         response_data = response.json()
         assert response_data["blockchain_verified"] is False
         assert "error" in response_data["verification_details"]
+    
+    @patch('loan_origination.api.db_utils')
+    @patch('loan_origination.api.get_fabric_gateway')
+    def test_verify_document_hash_reuses_cached_result(self, mock_gateway, mock_db_utils,
+                                                       mock_actor, mock_loan, mock_document):
+        """Test repeated verification of an unchanged hash skips the chaincode."""
+        from main import app
+        from shared.auth import actor_manager, jwt_manager
+        
+        actor_manager._actors[mock_actor.actor_id] = mock_actor
+        headers = {"Authorization": f"Bearer {jwt_manager.create_access_token(mock_actor)}"}
+        mock_db_utils.get_loan_and_document.return_value = (mock_loan, mock_document)
+        
+        mock_gateway.return_value = _FakeGateway(ret={
+            "success": True,
+            "stored_hash": "abc123def456",
+            "hash_match": True,
+            "transaction_id": "tx123"
+        })
+        
+        client = TestClient(app)
+        details = []
+        for _ in range(2):
+            response = client.post("/api/v1/loans/LOAN_TEST123/documents/1/verify", headers=headers)
+            assert response.status_code == 200
+            details.append(response.json()["verification_details"])
+        
+        assert all(detail["match"] is True for detail in details)
+        # Only the first call made a ledger transaction
+        assert details[0]["transaction_id"] == "tx123" and details[0]["cached"] is False
+        assert details[1]["transaction_id"] is None and details[1]["cached"] is True
+        assert mock_gateway.return_value.invoke_count == 1
+        mock_db_utils.update_document_verification_status.assert_called_once_with(1, "VERIFIED")
 
 
 class TestDocumentValidation:
     """Test document validation functionality."""
     
-    def test_calculate_file_hash(self, sample_file_content):
+    def test_calculate_file_hash(self, sample_file_stream):
         """Test file hash calculation."""
         from loan_origination.api import _calculate_file_hash
         
-        expected_hash = hashlib.sha256(sample_file_content).hexdigest()
-        calculated_hash = _calculate_file_hash(sample_file_content)
+        file_stream, expected_hash = sample_file_stream
+        calculated_hash, file_size = _calculate_file_hash(file_stream)
         
         assert calculated_hash == expected_hash
+        assert file_size == len(file_stream.getvalue())
+    
+    def test_calculate_file_hash_spans_multiple_blocks(self):
+        """Test hashing a file larger than one read block."""
+        from loan_origination.api import _calculate_file_hash, _UPLOAD_CHUNK_SIZE
+        
+        content = bytes(range(256)) * (_UPLOAD_CHUNK_SIZE // 256 * 2 + 1)
+        
+        assert _calculate_file_hash(BytesIO(content)) == (hashlib.sha256(content).hexdigest(), len(content))
     
     def test_generate_document_id(self):
         """Test document ID generation."""
@@ -133,7 +133,7 @@ class TestLoanHistoryRetrieval:
                                     mock_loan, mock_history_records):
         """Test successful loan history retrieval."""
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
-        mock_db_utils.get_loan_history.return_value = mock_history_records
+        mock_db_utils.get_loan_history_paginated.return_value = (mock_history_records, 2)
         
         response = client.get(
             "/api/v1/loans/LOAN_TEST001/history",
@@ -151,8 +151,10 @@ class TestLoanHistoryRetrieval:
         assert data["total"] == 2
         assert data["items"][0]["change_type"] == "STATUS_CHANGE"
         assert data["items"][1]["change_type"] == "APPROVAL"
+        assert data["next_cursor"] is None
         
-        mock_db_utils.get_loan_history.assert_called_once_with("LOAN_TEST001")
+        mock_db_utils.get_loan_history.assert_not_called()
+        mock_db_utils.get_loan_by_loan_id.assert_called_once_with("LOAN_TEST001")
     
     @patch('loan_origination.api.db_utils')
     def test_get_loan_history_not_found(self, mock_db_utils, client, underwriter_auth_headers):
@@ -197,6 +199,57 @@ class TestLoanHistoryPagination:
         assert data["has_previous"] == False
         assert len(data["items"]) == 1
     
+    @patch('loan_origination.api.db_utils')
+    def test_get_loan_history_with_cursor(self, mock_db_utils, client, underwriter_auth_headers,
+                                          mock_loan, mock_history_records):
+        """Test keyset pagination returns and accepts an opaque cursor."""
+        from loan_origination.api import _encode_history_cursor
+        
+        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
+        # One lookahead row beyond the requested page signals a following page
+        mock_db_utils.get_loan_history_paginated.return_value = (mock_history_records, 2)
+        
+        response = client.get(
+            "/api/v1/loans/LOAN_TEST001/history?page_size=1",
+            headers=underwriter_auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["items"]) == 1
+        next_cursor = data["next_cursor"]
+        first = mock_history_records[0]
+        assert next_cursor == _encode_history_cursor(first.timestamp, first.id)
+        
+        # The last page is exactly full: no lookahead row, so no further cursor
+        mock_db_utils.get_loan_history_paginated.return_value = (mock_history_records[1:], None)
+        response = client.get(
+            f"/api/v1/loans/LOAN_TEST001/history?page_size=1&cursor={next_cursor}",
+            headers=underwriter_auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        _, kwargs = mock_db_utils.get_loan_history_paginated.call_args
+        assert kwargs["cursor"] == (first.timestamp, first.id)
+        data = response.json()
+        assert len(data["items"]) == 1
+        assert data["next_cursor"] is None
+        assert data["has_next"] is False
+        assert data["has_previous"] is True
+        assert data["total"] is None and data["total_pages"] is None
+    
+    @patch('loan_origination.api.db_utils')
+    def test_get_loan_history_invalid_cursor(self, mock_db_utils, client, underwriter_auth_headers,
+                                             mock_loan):
+        """Test loan history with a malformed cursor."""
+        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
+        
+        response = client.get(
+            "/api/v1/loans/LOAN_TEST001/history?cursor=not-a-cursor",
+            headers=underwriter_auth_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
     def test_get_loan_history_invalid_pagination(self, client, underwriter_auth_headers):
         """Test loan history with invalid pagination parameters."""
         # Test invalid page
@@ -264,15 +317,22 @@ class TestAuditReportGeneration:
     """Test cases for audit report generation."""
     
     @patch('loan_origination.api.db_utils')
-    @patch('loan_origination.api._verify_history_integrity')
-    def test_generate_audit_report_basic(self, mock_verify_integrity, mock_db_utils, 
+    @patch('loan_origination.api._fetch_ledger_history')
+    def test_generate_audit_report_basic(self, mock_fetch_ledger, mock_db_utils, 
                                        client, underwriter_auth_headers, mock_loan, 
                                        mock_customer, mock_history_records):
         """Test basic audit report generation."""
         mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
         mock_loan.customer = mock_customer
         mock_db_utils.get_loan_history.return_value = mock_history_records
-        mock_verify_integrity.return_value = True
+        mock_fetch_ledger.return_value = [
+            {
+                "transactionID": record.blockchain_transaction_id,
+                "changeType": record.change_type,
+                "timestamp": record.timestamp.isoformat() + "Z"
+            }
+            for record in mock_history_records
+        ]
         
         report_request = {
             "report_type": "COMPREHENSIVE",
@@ -292,11 +352,39 @@ class TestAuditReportGeneration:
         assert data["total_records"] == 2
         assert data["integrity_verified"] == True
         assert data["blockchain_hash_matches"] == 2
+        # The loan's ledger history is fetched once for all records
+        mock_fetch_ledger.assert_called_once_with("LOAN_TEST001")
         assert "loan_application" in data["data"]
         assert "history_summary" in data["data"]
         assert "timeline" in data["data"]
         assert "blockchain_verification" in data["data"]
     
+    @patch('loan_origination.api.db_utils')
+    @patch('loan_origination.api._fetch_ledger_history')
+    def test_generate_audit_report_ledger_unavailable(self, mock_fetch_ledger, mock_db_utils,
+                                                      client, underwriter_auth_headers, mock_loan,
+                                                      mock_customer, mock_history_records):
+        """Test a failed ledger query marks every record unverified."""
+        mock_db_utils.get_loan_by_loan_id.return_value = mock_loan
+        mock_loan.customer = mock_customer
+        mock_db_utils.get_loan_history.return_value = mock_history_records
+        mock_fetch_ledger.side_effect = Exception("Blockchain unavailable")
+        
+        response = client.post(
+            "/api/v1/loans/LOAN_TEST001/audit-report",
+            json={"report_type": "COMPREHENSIVE", "include_blockchain_verification": True},
+            headers=underwriter_auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["integrity_verified"] == False
+        assert data["blockchain_hash_matches"] == 0
+        details = data["data"]["blockchain_verification"]["verification_details"]
+        assert [detail["verified"] for detail in details] == [False, False]
+        assert all(detail["error"] == "Blockchain unavailable" for detail in details)
+        mock_fetch_ledger.assert_called_once()
+    
     @patch('loan_origination.api.db_utils')
     def test_generate_audit_report_with_date_filter(self, mock_db_utils, client, 
                                                   underwriter_auth_headers, mock_loan, 
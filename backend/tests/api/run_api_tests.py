@@ -11,7 +11,7 @@ import sys
 from pathlib import Path
 
 
-def run_api_tests(test_type="all", verbose=True, markers=None, output_file=None):
+def run_api_tests(test_type="all", verbose=True, markers=None, output_file=None, parallel=True):
     """Run API tests with specified parameters."""
     
     # Base pytest command
@@ -40,6 +40,10 @@ def run_api_tests(test_type="all", verbose=True, markers=None, output_file=None)
     # Add output options
     cmd.extend(["--tb=short", "--strict-markers"])
     
+    # Spread test classes across workers (loadscope keeps each class's fixtures on one worker)
+    if parallel:
+        cmd.extend(["-n", "auto", "--dist=loadscope"])
+    
     # Add output file if specified
     if output_file:
         cmd.extend(["--junitxml", output_file])
@@ -96,6 +100,13 @@ Examples:
         help="Run tests in quiet mode"
     )
     
+    parser.add_argument(
+        "--no-parallel",
+        dest="parallel",
+        action="store_false",
+        help="Run tests serially instead of across pytest-xdist workers"
+    )
+    
     args = parser.parse_args()
     
     # Run tests
@@ -103,7 +114,8 @@ Examples:
         test_type=args.type,
         verbose=not args.quiet,
         markers=args.markers,
-        output_file=args.output
+        output_file=args.output,
+        parallel=args.parallel
     )
     
     if return_code == 0:
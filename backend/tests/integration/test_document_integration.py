@@ -58,12 +58,14 @@ def test_document_utility_functions():
     """Test document utility functions."""
     from loan_origination.api import _calculate_file_hash, _generate_document_id
     import hashlib
+    from io import BytesIO
     
     # Test hash calculation
     test_content = b"test document content"
     expected_hash = hashlib.sha256(test_content).hexdigest()
-    actual_hash = _calculate_file_hash(test_content)
+    actual_hash, file_size = _calculate_file_hash(BytesIO(test_content))
     assert actual_hash == expected_hash
+    assert file_size == len(test_content)
     
     # Test document ID generation
     doc_id = _generate_document_id()
@@ -110,6 +110,15 @@ class TestDatabaseManager:
         assert manager.engine is not None
         assert manager.SessionLocal is not None
     
+    def test_file_backed_sqlite_uses_wal_pool(self, temp_db_path):
+        """Test file-backed SQLite is pooled and switched to WAL mode."""
+        manager = DatabaseManager(temp_db_path)
+        
+        assert manager.engine.pool.__class__.__name__ == "QueuePool"
+        with manager.engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        manager.engine.dispose()
+    
     def test_create_tables(self, test_db_manager):
         """Test table creation."""
         # Tables should already be created by fixture
@@ -378,6 +387,20 @@ class TestDatabaseUtilities:
         assert retrieved_actor.actor_id == "test_actor_001"
         assert retrieved_actor.role == "Underwriter"
     
+    def test_get_actor_by_actor_id_is_cached(self, test_db_utils, sample_actor_data):
+        """Test repeated actor lookups are served without a session."""
+        test_db_utils.create_actor(sample_actor_data)
+        first = test_db_utils.get_actor_by_actor_id("test_actor_001")
+        
+        with patch.object(test_db_utils.db_manager, 'session_scope') as mock_scope:
+            second = test_db_utils.get_actor_by_actor_id("test_actor_001")
+        
+        assert second is first
+        mock_scope.assert_not_called()
+        
+        test_db_utils.invalidate_actor("test_actor_001")
+        assert test_db_utils.get_actor_by_actor_id("test_actor_001") is not first
+    
     def test_get_nonexistent_actor(self, test_db_utils):
         """Test getting nonexistent actor."""
         actor = test_db_utils.get_actor_by_actor_id("nonexistent")
@@ -397,6 +420,9 @@ class TestDatabaseUtilities:
         assert customer.id is not None
         assert customer.customer_id == "test_customer_001"
         assert customer.created_by_actor_id == actor.id
+        # Column defaults are populated without a post-insert refresh
+        assert customer.created_at is not None
+        assert customer.updated_at is not None
     
     def test_create_loan_application(self, test_db_utils, sample_actor_data, sample_customer_data, sample_loan_data):
         """Test creating loan application through utilities."""
@@ -451,6 +477,7 @@ class TestDatabaseUtilities:
         # Verify status was updated
         updated_loan = test_db_utils.get_loan_by_loan_id("test_loan_001")
         assert updated_loan.application_status == "APPROVED"
+        assert updated_loan.customer.customer_id == "test_customer_001"
         
         # Verify history was created
         history = test_db_utils.get_loan_history("test_loan_001")
@@ -459,6 +486,140 @@ class TestDatabaseUtilities:
         assert history[0].previous_status == "SUBMITTED"
         assert history[0].new_status == "APPROVED"
     
+    def test_get_loan_history_paginated_with_cursor(self, test_db_utils, sample_actor_data,
+                                                    sample_customer_data, sample_loan_data):
+        """Test keyset history pages continue from the cursor and skip the count."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        
+        customer_data = sample_customer_data.copy()
+        customer_data['created_by_actor_id'] = actor.id
+        customer = test_db_utils.create_customer(customer_data)
+        
+        loan_data = sample_loan_data.copy()
+        loan_data['customer_id'] = customer.id
+        loan_data['created_by_actor_id'] = actor.id
+        loan_data['current_owner_actor_id'] = actor.id
+        loan = test_db_utils.create_loan_application(loan_data)
+        
+        for new_status in ("UNDERWRITING", "APPROVED", "DISBURSED"):
+            test_db_utils.update_loan_status(loan.loan_application_id, new_status, actor.id)
+        
+        first_page, total = test_db_utils.get_loan_history_paginated(loan.loan_application_id, 1, 2)
+        assert [record.new_status for record in first_page] == ["DISBURSED", "APPROVED"]
+        assert total == 3
+        
+        last = first_page[-1]
+        second_page, total = test_db_utils.get_loan_history_paginated(
+            loan.loan_application_id, 1, 2, cursor=(last.timestamp, last.id), lookahead=True
+        )
+        assert [record.new_status for record in second_page] == ["UNDERWRITING"]
+        assert total is None
+        
+        assert test_db_utils.get_loan_history_paginated("missing_loan", 1, 2) == ([], 0)
+    
+    def test_get_latest_loan_status(self, test_db_utils, sample_actor_data, sample_customer_data, sample_loan_data):
+        """Test reading a loan's latest status and last change time."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        
+        customer_data = sample_customer_data.copy()
+        customer_data['created_by_actor_id'] = actor.id
+        customer = test_db_utils.create_customer(customer_data)
+        
+        loan_data = sample_loan_data.copy()
+        loan_data['customer_id'] = customer.id
+        loan_data['created_by_actor_id'] = actor.id
+        loan_data['current_owner_actor_id'] = actor.id
+        test_db_utils.create_loan_application(loan_data)
+        
+        latest = test_db_utils.get_latest_loan_status("test_loan_001")
+        assert latest["application_status"] == "SUBMITTED"
+        assert latest["last_change"] is None
+        
+        test_db_utils.update_loan_status("test_loan_001", "UNDERWRITING", actor.id)
+        test_db_utils.refresh_loan_latest_status()
+        
+        latest = test_db_utils.get_latest_loan_status("test_loan_001")
+        assert latest["application_status"] == "UNDERWRITING"
+        assert latest["last_change"] is not None
+        assert test_db_utils.get_latest_loan_status("missing_loan") is None
+    
+    def test_update_loan_status_unknown_loan(self, test_db_utils, sample_actor_data):
+        """Test updating the status of a missing loan writes nothing."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        
+        assert test_db_utils.update_loan_status("missing_loan", "APPROVED", actor.id) is False
+        
+        with test_db_utils.db_manager.session_scope() as session:
+            assert session.query(LoanApplicationHistoryModel).count() == 0
+    
+    def test_get_loan_and_document(self, test_db_utils, sample_actor_data, sample_customer_data, sample_loan_data):
+        """Test fetching a loan and its document in one query."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        
+        customer_data = sample_customer_data.copy()
+        customer_data['created_by_actor_id'] = actor.id
+        customer = test_db_utils.create_customer(customer_data)
+        
+        loan_data = sample_loan_data.copy()
+        loan_data['customer_id'] = customer.id
+        loan_data['created_by_actor_id'] = actor.id
+        loan_data['current_owner_actor_id'] = actor.id
+        loan = test_db_utils.create_loan_application(loan_data)
+        
+        with test_db_utils.db_manager.session_scope() as session:
+            document = LoanDocumentModel(
+                loan_application_id=loan.id,
+                document_type="IDENTITY",
+                document_name="passport.pdf",
+                document_hash="abc123",
+                verification_status="PENDING",
+                uploaded_by_actor_id=actor.id
+            )
+            session.add(document)
+            session.flush()
+            document_id = document.id
+        
+        pair = test_db_utils.get_loan_and_document("test_loan_001", document_id)
+        
+        assert pair is not None
+        fetched_loan, fetched_document = pair
+        assert fetched_loan.loan_application_id == "test_loan_001"
+        assert fetched_document.id == document_id
+        assert fetched_document.document_hash == "abc123"
+        
+        assert test_db_utils.get_loan_and_document("other_loan", document_id) is None
+        assert test_db_utils.get_loan_and_document("test_loan_001", document_id + 1) is None
+        
+        # Documents stay readable once their session has been released
+        document = test_db_utils.get_loan_document_by_id(document_id)
+        assert document.verification_status == "PENDING"
+        assert [d.id for d in test_db_utils.get_loan_documents("test_loan_001")] == [document_id]
+    
+    def test_create_compliance_events_bulk(self, test_db_utils, sample_actor_data):
+        """Test creating compliance events in bulk."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        
+        events_data = [
+            {
+                "event_id": f"bulk_event_{i:03d}",
+                "event_type": "AML_CHECK",
+                "affected_entity_type": "CUSTOMER",
+                "affected_entity_id": "bulk_customer_001",
+                "description": f"Bulk AML check {i}",
+                "actor_id": actor.id
+            }
+            for i in range(3)
+        ]
+        
+        ids = test_db_utils.create_compliance_events_bulk(events_data)
+        
+        assert len(ids) == 3
+        assert len(set(ids)) == 3
+        events = test_db_utils.get_compliance_events_by_entity("CUSTOMER", "bulk_customer_001")
+        assert sorted(event.id for event in events) == sorted(ids)
+        assert all(event.severity == "INFO" for event in events)
+        assert test_db_utils.create_compliance_events_bulk([]) == []
+    
     def test_get_compliance_events_by_entity(self, test_db_utils, sample_actor_data):
         """Test getting compliance events by entity."""
         # Create actor first
@@ -494,6 +655,31 @@ class TestDatabaseUtilities:
         assert len(events) == 2
         assert events[0].event_type in ["AML_CHECK", "KYC_VERIFICATION"]
         assert events[1].event_type in ["AML_CHECK", "KYC_VERIFICATION"]
+        assert not hasattr(events[0], "__dict__")
+    
+    def test_get_compliance_event_detail(self, test_db_utils, sample_actor_data):
+        """Test list results omit large columns while the detail getter loads them."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        test_db_utils.create_compliance_event({
+            "event_id": "test_event_detail",
+            "event_type": "AML_CHECK",
+            "affected_entity_type": "CUSTOMER",
+            "affected_entity_id": "test_customer_detail",
+            "severity": "INFO",
+            "description": "AML check performed",
+            "details": {"score": 12},
+            "actor_id": actor.id
+        })
+        
+        listed = test_db_utils.get_compliance_events_by_entity("CUSTOMER", "test_customer_detail")
+        assert listed[0].event_id == "test_event_detail"
+        assert not hasattr(listed[0], "details")
+        assert not hasattr(listed[0], "description")
+        
+        event = test_db_utils.get_compliance_event_detail("test_event_detail")
+        assert event.description == "AML check performed"
+        assert event.details == {"score": 12}
+        assert test_db_utils.get_compliance_event_detail("missing_event") is None
 
 
 class TestGlobalInstances:
@@ -583,4 +769,53 @@ class TestDatabaseIntegration:
             loan.loan_application_id
         )
         assert len(events) == 1
-        assert events[0].event_type == "STATUS_CHANGE"
\ No newline at end of file
+        assert events[0].event_type == "STATUS_CHANGE"    
+    def test_unit_of_work_workflow(self, test_db_utils, sample_actor_data, sample_customer_data, sample_loan_data):
+        """Test a multi-entity workflow committed in a single transaction."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        
+        with test_db_utils.unit_of_work() as session:
+            customer_data = sample_customer_data.copy()
+            customer_data['created_by_actor_id'] = actor.id
+            customer = test_db_utils.create_customer_in(session, customer_data)
+            
+            loan_data = sample_loan_data.copy()
+            loan_data['customer_id'] = customer.id
+            loan_data['created_by_actor_id'] = actor.id
+            loan_data['current_owner_actor_id'] = actor.id
+            loan = test_db_utils.create_loan_application_in(session, loan_data)
+            
+            assert test_db_utils.update_loan_status_in(
+                session, loan.loan_application_id, "UNDERWRITING", actor.id
+            ) is True
+            test_db_utils.create_compliance_event_in(session, {
+                "event_id": f"event_{loan.loan_application_id}",
+                "event_type": "STATUS_CHANGE",
+                "affected_entity_type": "LOAN_APPLICATION",
+                "affected_entity_id": loan.loan_application_id,
+                "severity": "INFO",
+                "description": "Loan status changed to underwriting",
+                "actor_id": actor.id
+            })
+        
+        # Created objects remain readable after the commit
+        assert customer.id is not None
+        assert loan.customer_id == customer.id
+        assert test_db_utils.get_loan_by_loan_id(loan.loan_application_id).application_status == "UNDERWRITING"
+        assert len(test_db_utils.get_loan_history(loan.loan_application_id)) == 1
+        assert len(test_db_utils.get_compliance_events_by_entity(
+            "LOAN_APPLICATION", loan.loan_application_id
+        )) == 1
+    
+    def test_unit_of_work_rolls_back_on_error(self, test_db_utils, sample_actor_data, sample_customer_data):
+        """Test nothing from a failed unit of work is committed."""
+        actor = test_db_utils.create_actor(sample_actor_data)
+        customer_data = sample_customer_data.copy()
+        customer_data['created_by_actor_id'] = actor.id
+        
+        with pytest.raises(RuntimeError):
+            with test_db_utils.unit_of_work() as session:
+                test_db_utils.create_customer_in(session, customer_data)
+                raise RuntimeError("workflow failed")
+        
+        assert test_db_utils.get_customer_by_customer_id(customer_data['customer_id']) is None
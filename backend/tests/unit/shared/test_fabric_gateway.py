@@ -2,6 +2,7 @@
 Unit tests for Fabric Gateway SDK wrapper.
 """
 
+import asyncio
 import pytest
 import pytest_asyncio
 import json
@@ -13,10 +14,14 @@ from shared.fabric_gateway import (
     FabricConfig,
     ChaincodeClient,
     ChaincodeType,
+    BufferPool,
+    ChannelPool,
     FabricError,
     ConnectionError,
     TransactionError,
     QueryError,
+    QueryResult,
+    TxResult,
     get_fabric_gateway,
     fabric_gateway_context,
     cleanup_gateway_pool
@@ -53,6 +58,14 @@ class TestFabricConfig:
         assert fabric_config.msp_id == "TestMSP"
         assert fabric_config.channel_name == "testchannel"
     
+    def test_fabric_config_is_frozen_and_hashable(self, fabric_config):
+        """Test FabricConfig is immutable, slotted and usable as a key."""
+        with pytest.raises(AttributeError):
+            fabric_config.msp_id = "OtherMSP"
+        
+        assert not hasattr(fabric_config, "__dict__")
+        assert {fabric_config: 1}[fabric_config._replace()] == 1
+    
     @patch('shared.fabric_gateway.settings')
     def test_fabric_config_from_settings(self, mock_settings):
         """Test FabricConfig creation from settings."""
@@ -97,6 +110,54 @@ class TestFabricGateway:
         assert fabric_gateway._is_connected is False
         assert len(fabric_gateway._connection_pool) == 0
     
+    @pytest.mark.asyncio
+    async def test_connect_opens_channel_pool(self, fabric_config):
+        """Test connecting opens the configured number of channels."""
+        gateway = FabricGateway(fabric_config._replace(channel_pool_size=3))
+        
+        await gateway.connect()
+        
+        assert len(gateway._connection_pool) == 3
+    
+    @pytest.mark.asyncio
+    async def test_keepalive_pings_every_channel_on_one_timer(self, fabric_config):
+        """Test a single keepalive task pings each pooled channel."""
+        fabric_config = fabric_config._replace(keepalive_interval_seconds=0.01)
+        gateway = FabricGateway(fabric_config)
+        
+        with patch.object(gateway, '_ping_channel', new_callable=AsyncMock) as mock_ping:
+            await gateway.connect()
+            await asyncio.sleep(0.03)
+            await gateway.disconnect()
+        
+        pinged = [call.args[0]["index"] for call in mock_ping.call_args_list]
+        assert set(pinged) == set(range(fabric_config.channel_pool_size))
+        assert gateway._keepalive_task is None
+    
+    @pytest.mark.asyncio
+    async def test_identity_validated_once(self, fabric_gateway):
+        """Test repeated transactions reuse the cached signing identity."""
+        await fabric_gateway.connect()
+        
+        await fabric_gateway.invoke_chaincode("customer", "CreateCustomer", ["a"])
+        await fabric_gateway.invoke_chaincode("customer", "CreateCustomer", ["b"])
+        
+        assert fabric_gateway.identity_cache_misses == 1
+        assert fabric_gateway.identity_cache_hits == 2
+        
+        fabric_gateway.invalidate_identities()
+        await fabric_gateway.invoke_chaincode("customer", "CreateCustomer", ["c"])
+        assert fabric_gateway.identity_cache_misses == 2
+    
+    def test_channel_pool_round_robin(self):
+        """Test channels are handed out in round-robin order."""
+        pool = ChannelPool("localhost:7051", 2)
+        pool.open()
+        
+        picked = [pool.next_channel()["index"] for _ in range(5)]
+        
+        assert picked == [0, 1, 0, 1, 0]
+    
     @pytest.mark.asyncio
     async def test_invoke_chaincode_success(self, fabric_gateway):
         """Test successful chaincode invocation."""
@@ -165,6 +226,210 @@ class TestFabricGateway:
         assert "transactions" in result
 
 
+class TestBatching:
+    """Test query coalescing and batched calls."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_are_coalesced(self, fabric_gateway):
+        """Test concurrent queries share a single batched evaluation."""
+        await fabric_gateway.connect()
+        
+        with patch.object(
+            fabric_gateway, '_evaluate_batch', wraps=fabric_gateway._evaluate_batch
+        ) as mock_evaluate:
+            results = await asyncio.gather(
+                *(fabric_gateway.query_chaincode("customer", "GetCustomer", [str(i)]) for i in range(5))
+            )
+        
+        assert mock_evaluate.call_count == 1
+        assert len(mock_evaluate.call_args.args[0]) == 5
+        assert all(result["status"] == "SUCCESS" for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_batch_flushes_at_max_size(self, fabric_config):
+        """Test a full batch is sent without waiting for the window."""
+        gateway = FabricGateway(
+            fabric_config._replace(max_requests_per_batch=2, max_batch_wait_ms=10_000)
+        )
+        await gateway.connect()
+        
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                gateway.query_chaincode("customer", "GetCustomer", ["1"]),
+                gateway.query_chaincode("customer", "GetCustomer", ["2"])
+            ),
+            timeout=1
+        )
+        
+        assert len(results) == 2
+    
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self, fabric_gateway):
+        """Test a failed batch raises in each coalesced caller."""
+        await fabric_gateway.connect()
+        
+        with patch.object(fabric_gateway, '_evaluate_batch', side_effect=RuntimeError("peer down")):
+            results = await asyncio.gather(
+                fabric_gateway._coalesce_query(("customer", "GetCustomer", ["1"])),
+                fabric_gateway._coalesce_query(("customer", "GetCustomer", ["2"])),
+                return_exceptions=True
+            )
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_query_many(self, fabric_gateway):
+        """Test explicit batched queries return one result per call."""
+        await fabric_gateway.connect()
+        
+        results = await fabric_gateway.query_many([
+            ("customer", "GetCustomer", ["1"]),
+            ("loan", "GetLoan", ["2"])
+        ])
+        
+        assert len(results) == 2
+        assert all(result["status"] == "SUCCESS" for result in results)
+        assert await fabric_gateway.query_many([]) == []
+    
+    @pytest.mark.asyncio
+    async def test_invoke_many(self, fabric_gateway):
+        """Test endorsed transactions are submitted together in order."""
+        await fabric_gateway.connect()
+        
+        with patch.object(
+            fabric_gateway, '_submit_batch', wraps=fabric_gateway._submit_batch
+        ) as mock_submit:
+            results = await fabric_gateway.invoke_many([
+                ("customer", "CreateCustomer", ["a"]),
+                ("loan", "SubmitLoan", ["b"])
+            ])
+        
+        mock_submit.assert_called_once()
+        submitted = mock_submit.call_args.args[0]
+        assert [result["transaction_id"] for result in results] == [
+            transaction["transaction_id"] for transaction in submitted
+        ]
+        assert [transaction["chaincode_name"] for transaction in submitted] == ["customer", "loan"]
+    
+    @pytest.mark.asyncio
+    async def test_proposals_reuse_header_template(self, fabric_gateway):
+        """Test proposals share the cached header and get distinct transaction IDs."""
+        await fabric_gateway.connect()
+        
+        with fabric_gateway._build_proposal("customer", "CreateCustomer", ["a"]) as (first_id, view):
+            first = bytes(view)
+        with fabric_gateway._build_proposal("customer", "CreateCustomer", ["a"]) as (second_id, view):
+            second = bytes(view)
+        template = fabric_gateway._header_template("customer")
+        
+        assert len(fabric_gateway._header_templates) == 1
+        assert first.startswith(template) and second.startswith(template)
+        assert first[len(template) + 24:].startswith(first_id.encode())
+        assert first.endswith(
+            len("CreateCustomer").to_bytes(4, "big") + b"CreateCustomer" + (1).to_bytes(4, "big") + b"a"
+        )
+        assert first_id != second_id
+        assert len(first_id) == 64
+    
+    @pytest.mark.asyncio
+    async def test_invoke_returns_frozen_result(self, fabric_gateway):
+        """Test invoke results are immutable and keep dict-style access."""
+        await fabric_gateway.connect()
+        
+        result = await fabric_gateway.invoke_chaincode("customer", "CreateCustomer", ["a"])
+        
+        assert isinstance(result, TxResult)
+        assert not hasattr(result, "__dict__")
+        assert result["status"] == result.status == "SUCCESS"
+        assert "payload" in result and "success" not in result
+        assert result.get("success") is None
+        assert result.as_dict()["transaction_id"] == result.transaction_id
+        with pytest.raises(KeyError):
+            result["success"]
+        with pytest.raises(AttributeError):
+            result.status = "FAILED"
+    
+    @pytest.mark.asyncio
+    async def test_proposal_buffers_are_reused(self, fabric_gateway):
+        """Test proposal buffers return to the pool and are handed out again."""
+        await fabric_gateway.connect()
+        
+        with fabric_gateway._build_proposal("customer", "CreateCustomer", ["a"]) as (_, view):
+            first_buffer = view.obj
+        with fabric_gateway._build_proposal("loan", "SubmitApplication", ["b"]) as (_, view):
+            assert view.obj is first_buffer
+        
+        assert len(fabric_gateway._buffer_pool) == 1
+    
+    def test_buffer_pool_drops_oversized_buffers(self):
+        """Test buffers larger than the pool size are not retained."""
+        pool = BufferPool(capacity=2, buffer_size=16)
+        
+        small = pool.acquire(8)
+        large = pool.acquire(32)
+        pool.release(small)
+        pool.release(large)
+        
+        assert len(small) == 16 and len(large) == 32
+        assert len(pool) == 1
+        assert pool.acquire(4) is small
+
+
+class TestQueryCaching:
+    """Test read-only result caching."""
+    
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_cached(self, fabric_gateway):
+        """Test identical queries at the same block height hit the cache."""
+        await fabric_gateway.connect()
+        
+        with patch.object(
+            fabric_gateway, '_evaluate_batch', wraps=fabric_gateway._evaluate_batch
+        ) as mock_evaluate:
+            first = await fabric_gateway.query_chaincode("customer", "GetCustomer", ["1"])
+            second = await fabric_gateway.query_chaincode("customer", "GetCustomer", ["1"])
+            await fabric_gateway.query_chaincode("customer", "GetCustomer", ["1"], consistent=True)
+        
+        assert first is second
+        assert mock_evaluate.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_new_block_or_own_commit_invalidates(self, fabric_gateway):
+        """Test a new committed block or a local invoke stops serving cached reads."""
+        await fabric_gateway.connect()
+        
+        with patch.object(
+            fabric_gateway, '_evaluate_batch', wraps=fabric_gateway._evaluate_batch
+        ) as mock_evaluate:
+            await fabric_gateway.query_chaincode("customer", "GetCustomer", ["1"])
+            fabric_gateway._committed_block_height += 1
+            await fabric_gateway.query_chaincode("customer", "GetCustomer", ["1"])
+            await fabric_gateway.invoke_chaincode("customer", "UpdateCustomer", ["1"])
+            await fabric_gateway.query_chaincode("customer", "GetCustomer", ["1"])
+        
+        assert mock_evaluate.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_committed_ledger_data_is_cached(self, fabric_gateway):
+        """Test committed transactions and blocks are served from cache."""
+        await fabric_gateway.connect()
+        
+        assert await fabric_gateway.get_transaction_by_id("tx_1") is await fabric_gateway.get_transaction_by_id("tx_1")
+        assert await fabric_gateway.get_block_by_number(7) is await fabric_gateway.get_block_by_number(7)
+    
+    @pytest.mark.asyncio
+    async def test_disconnect_stops_block_height_polling(self, fabric_gateway):
+        """Test the block height poller runs while connected only."""
+        await fabric_gateway.connect()
+        task = fabric_gateway._block_height_task
+        assert task is not None and not task.done()
+        
+        await fabric_gateway.disconnect()
+        await asyncio.sleep(0)
+        
+        assert task.cancelled()
+
+
 class TestChaincodeClient:
     """Test ChaincodeClient class."""
     
@@ -208,6 +473,21 @@ class TestChaincodeClient:
         result = await chaincode_client.get_entity_history("customer_123")
         
         assert isinstance(result, list)
+    
+    @pytest.mark.asyncio
+    async def test_get_entity_history_normalizes_payload(self, chaincode_client):
+        """Test list payloads are returned as-is and anything else becomes empty."""
+        records = [{"version": 1}, {"version": 2}]
+        
+        with patch.object(chaincode_client.gateway, 'query_chaincode', new_callable=AsyncMock) as mock_query:
+            mock_query.return_value = QueryResult(status="SUCCESS", payload=records, timestamp="t")
+            assert await chaincode_client.get_entity_history("customer_123") is records
+            
+            mock_query.return_value = {"status": "SUCCESS", "payload": {"version": 1}}
+            assert await chaincode_client.get_entity_history("customer_123") == []
+            
+            mock_query.return_value = {"status": "SUCCESS"}
+            assert await chaincode_client.get_entity_history("customer_123") == []
 
 
 class TestConnectionPooling:
@@ -235,6 +515,33 @@ class TestConnectionPooling:
         
         assert gateway1 is gateway2
     
+    @pytest.mark.asyncio
+    async def test_get_fabric_gateway_concurrent_first_calls_connect_once(self, fabric_config):
+        """Test that concurrent first calls share a single connection."""
+        await cleanup_gateway_pool()
+        
+        with patch.object(FabricGateway, 'connect', autospec=True) as mock_connect:
+            gateways = await asyncio.gather(
+                *(get_fabric_gateway(fabric_config) for _ in range(5))
+            )
+        
+        assert mock_connect.call_count == 1
+        assert all(gateway is gateways[0] for gateway in gateways)
+        await cleanup_gateway_pool()
+    
+    @pytest.mark.asyncio
+    async def test_get_fabric_gateway_default_skips_pool_lookup(self):
+        """Test that the default gateway is returned without a pool lookup."""
+        await cleanup_gateway_pool()
+        
+        gateway = await get_fabric_gateway()
+        with patch.object(FabricConfig, 'from_settings') as mock_from_settings:
+            assert await get_fabric_gateway() is gateway
+        
+        mock_from_settings.assert_not_called()
+        assert await get_fabric_gateway(FabricConfig.from_settings()) is gateway
+        await cleanup_gateway_pool()
+    
     @pytest.mark.asyncio
     async def test_fabric_gateway_context_manager(self, fabric_config):
         """Test fabric gateway context manager."""
@@ -260,6 +567,21 @@ class TestConnectionPooling:
         
         # Verify connection is closed
         assert gateway._is_connected is False
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_gateway_pool_continues_past_failures(self, fabric_config):
+        """Test one failing disconnect does not stop the others."""
+        await cleanup_gateway_pool()
+        other_config = fabric_config._replace(msp_id="Org2MSP")
+        failing = await get_fabric_gateway(fabric_config)
+        healthy = await get_fabric_gateway(other_config)
+        
+        with patch.object(failing, 'disconnect', AsyncMock(side_effect=RuntimeError("boom"))):
+            await cleanup_gateway_pool()
+        
+        assert healthy._is_connected is False
+        assert await get_fabric_gateway(fabric_config) is not failing
+        await cleanup_gateway_pool()
 
 
 class TestErrorHandling:
@@ -305,7 +627,6 @@ class TestRetryLogic:
         await fabric_gateway.connect()
         
         # Test that retry logic exists by checking the decorator
-        # The actual retry behavior is handled by tenacity
         assert hasattr(fabric_gateway.invoke_chaincode, '__wrapped__')
         
         # Test successful invocation
@@ -318,9 +639,52 @@ class TestRetryLogic:
         await fabric_gateway.connect()
         
         # Test that retry logic exists by checking the decorator
-        # The actual retry behavior is handled by tenacity
         assert hasattr(fabric_gateway.query_chaincode, '__wrapped__')
         
         # Test successful query
         result = await fabric_gateway.query_chaincode("test", "test", [])
-        assert result["status"] == "SUCCESS"
\ No newline at end of file
+        assert result["status"] == "SUCCESS"
+    
+    @pytest.mark.asyncio
+    async def test_retry_backoff_is_jittered(self, fabric_gateway):
+        """Test retries sleep a random, capped interval starting on the first retry."""
+        await fabric_gateway.connect()
+        sleeps = []
+        
+        async def record_sleep(seconds):
+            sleeps.append(seconds)
+        
+        with patch.object(fabric_gateway, '_coalesce_query', side_effect=RuntimeError("conflict")):
+            with patch('asyncio.sleep', side_effect=record_sleep):
+                with pytest.raises(Exception):
+                    await fabric_gateway.query_chaincode("test", "test", [], consistent=True)
+        
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 0.05
+        assert all(0 <= seconds <= 1.0 for seconds in sleeps)
+    
+    @pytest.mark.asyncio
+    async def test_retry_reraises_last_error_after_final_attempt(self, fabric_gateway):
+        """Test exhausted retries surface the gateway error itself."""
+        await fabric_gateway.connect()
+        
+        with patch.object(fabric_gateway, '_coalesce_query', side_effect=RuntimeError("conflict")) as mock_query:
+            with patch('asyncio.sleep', new_callable=AsyncMock):
+                with pytest.raises(QueryError, match="conflict"):
+                    await fabric_gateway.query_chaincode("test", "test", [], consistent=True)
+        
+        assert mock_query.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_retry_recovers_without_extra_attempts(self, fabric_gateway):
+        """Test a call that succeeds on retry stops retrying."""
+        await fabric_gateway.connect()
+        results = [RuntimeError("conflict"), QueryResult(status="SUCCESS", payload={}, timestamp="t")]
+        
+        with patch.object(fabric_gateway, '_coalesce_query', side_effect=results) as mock_query:
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                result = await fabric_gateway.query_chaincode("test", "test", [], consistent=True)
+        
+        assert result["status"] == "SUCCESS"
+        assert mock_query.call_count == 2
+        mock_sleep.assert_awaited_once()
@@ -1,9 +1,11 @@
 """
 Test main application endpoints
 """
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
-from main import app
+from main import app, run_periodically
 
 client = TestClient(app)
 
@@ -17,4 +19,32 @@ def test_health_check():
     """Test health check endpoint"""
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json()["status"] == "healthy"
\ No newline at end of file
+    assert response.json()["status"] == "healthy"
+
+
+def test_oversized_upload_rejected_by_content_length():
+    """Test oversized request bodies are rejected before being read"""
+    response = client.post(
+        "/api/v1/loans/LOAN_123/documents",
+        headers={"content-length": str(50 * 1024 * 1024)},
+        content=b"",
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_run_periodically_survives_job_failures():
+    """Test a failing maintenance job is retried on the next interval"""
+    calls = []
+    
+    def refresh():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+    
+    task = asyncio.create_task(run_periodically(0, refresh))
+    while len(calls) < 2:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    
+    assert calls[:2] == [0, 1]